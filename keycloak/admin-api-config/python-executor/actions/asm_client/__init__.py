@@ -1 +0,0 @@
-# ASM client package
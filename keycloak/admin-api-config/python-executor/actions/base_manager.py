@@ -2,37 +2,188 @@
 Base Manager Class
 Abstract base class for all Keycloak configuration managers
 """
+import asyncio
+from functools import partial
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Awaitable, Callable, Iterable, List, Optional, Tuple
 from utils.keycloak_client import KeycloakClient
+from utils.async_keycloak_client import AsyncKeycloakClient
+from utils.realm_snapshot import RealmSnapshot
 from utils.logger import PadminiLogger
-from config.constants import Constants
+from config.desired_state import DesiredState
+from actions.plan import Plan
+from utils.fingerprint import fingerprint_update, stored_fingerprint
 
 
 class BaseManager(ABC):
     """Base class for all Keycloak configuration managers."""
     
-    def __init__(self, keycloak_client: KeycloakClient, constants: Constants):
+    # Orchestrator steps that must complete before this manager's create()
+    # (and that may only be destroyed after this manager's destroy())
+    dependencies: Tuple[str, ...] = ()
+    
+    def __init__(
+        self,
+        keycloak_client: KeycloakClient,
+        constants: DesiredState,
+        optimistic_create: bool = False,
+        trust_fingerprints: bool = True
+    ):
         self.keycloak_client = keycloak_client
         self.constants = constants
         self.logger = PadminiLogger(self.__class__.__name__)
         self.realm_name = constants.REALM_NAME
+        self.optimistic_create = optimistic_create
+        # Skip resources whose recorded fingerprint matches the desired one
+        self.trust_fingerprints = trust_fingerprints
+    
+    @property
+    def aio(self) -> AsyncKeycloakClient:
+        """Asyncio client sharing this manager's connection and token."""
+        return self.keycloak_client.aio
+    
+    def _run_concurrently(self, calls: Iterable[Awaitable[Any]]) -> List[Any]:
+        """Run independent API coroutines concurrently, results in order."""
+        async def _gather():
+            return await self.aio.gather(*calls)
+        
+        return asyncio.run(_gather())
     
     @abstractmethod
     def create(self) -> bool:
         """Create the configuration component."""
         pass
     
+    @abstractmethod
+    def plan(self, snapshot: Optional[RealmSnapshot] = None) -> Plan:
+        """
+        Compute the changes needed to reach the desired state (reads only).
+        
+        With a snapshot, current state is read from it instead of the API.
+        """
+        pass
+    
+    def apply(self, plan: Plan) -> bool:
+        """Print the plan and run its changes concurrently."""
+        plan.log(self.logger)
+        if plan.is_empty and not plan.stamps:
+            return True
+        return asyncio.run(self._run_changes(plan))
+    
+    async def _run_changes(self, plan: Plan) -> bool:
+        """
+        Run a plan's changes concurrently and log each outcome.
+        
+        Fingerprints are recorded afterwards, only for resources whose
+        changes all succeeded, so a failed write is retried next run.
+        """
+        results = await self.aio.gather(*(
+            change.action() for change in plan.changes
+        ))
+        
+        self.keycloak_client.record_applied(sum(1 for result in results if result))
+        
+        success = True
+        failed = set()
+        for change, result in zip(plan.changes, results):
+            if result:
+                self.logger.success(f"Applied: {change.describe()}")
+            else:
+                self.logger.error(f"Failed: {change.describe()}")
+                failed.add(change.resource)
+                success = False
+        
+        stamps = [
+            (resource, stamp) for resource, stamp in plan.stamps.items()
+            if resource not in failed
+        ]
+        recorded = await self.aio.gather(*(stamp() for _, stamp in stamps))
+        for (resource, _), result in zip(stamps, recorded):
+            if not result:
+                # Only costs a full comparison next run
+                self.logger.warning(f"Failed to record fingerprint of '{resource}'")
+        return success
+    
+    def _fingerprint_matches(self, current: Dict[str, Any], value: str) -> bool:
+        """Whether an existing resource is recorded as converged to value."""
+        return self.trust_fingerprints and stored_fingerprint(current) == value
+    
+    def _stamp_fingerprint(
+        self,
+        plan: Plan,
+        resource: str,
+        current: Dict[str, Any],
+        value: str,
+        update: Callable[[Dict[str, Any]], Awaitable[bool]]
+    ):
+        """Plan recording value through update() unless already stored."""
+        if stored_fingerprint(current) != value:
+            plan.stamp(resource, partial(update, fingerprint_update(value)))
+    
+    def _creates_optimistically(self) -> bool:
+        """
+        Whether to POST first instead of reading current state.
+        
+        Only worthwhile in a realm created during this run, where almost
+        nothing exists yet; in an existing realm the read-first plan is
+        cheaper than a round of conflicting POSTs.
+        """
+        return (
+            self.optimistic_create
+            and self.realm_name in self.keycloak_client.created_realms
+        )
+    
+    def _create_optimistically(
+        self,
+        resource_type: str,
+        creates: Dict[str, Callable[[], Awaitable[Optional[bool]]]]
+    ) -> Optional[List[str]]:
+        """
+        Run POST-first creates concurrently.
+        
+        Each create returns True (created), False (already existed, 409)
+        or None (failed). Returns the names that already existed and still
+        need a plan, or None if any create failed.
+        """
+        names = list(creates)
+        results = self._run_concurrently(create() for create in creates.values())
+        
+        self.keycloak_client.record_applied(sum(1 for result in results if result))
+        
+        existing, failed = [], False
+        for name, result in zip(names, results):
+            description = f"+ create {resource_type} '{name}'"
+            if result is None:
+                self.logger.error(f"Failed: {description}")
+                failed = True
+            elif result:
+                self.logger.success(f"Applied: {description}")
+            else:
+                existing.append(name)
+        
+        if existing:
+            self.logger.info(f"Already present, planning instead: {existing}")
+        return None if failed else existing
+    
     @abstractmethod
     def destroy(self) -> bool:
         """Destroy/rollback the configuration component."""
         pass
     
     @abstractmethod
-    def validate(self) -> bool:
-        """Validate the configuration component."""
+    def validate(self, snapshot: Optional[RealmSnapshot] = None) -> bool:
+        """Validate the configuration component against a realm snapshot."""
         pass
     
+    def _get_snapshot(
+        self,
+        snapshot: Optional[RealmSnapshot]
+    ) -> Optional[RealmSnapshot]:
+        """Use the shared snapshot, or take one for this manager alone."""
+        if snapshot is not None:
+            return snapshot
+        return RealmSnapshot.fetch(self.keycloak_client, self.realm_name)
+    
     def _handle_api_error(self, operation: str, error: Exception) -> bool:
         """Common error handling for API operations."""
         self.logger.error(f"{operation} failed: {str(error)}")
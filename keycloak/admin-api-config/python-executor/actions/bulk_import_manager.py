@@ -0,0 +1,134 @@
+"""
+Bulk Import Manager
+Creates clients, realm roles and groups in one partialImport request
+"""
+from functools import partial
+from typing import Dict, Any, List, Optional
+from actions.base_manager import BaseManager
+from actions.plan import Plan, ChangeType
+from utils.realm_snapshot import RealmSnapshot
+
+IF_RESOURCE_EXISTS_POLICIES = ('SKIP', 'OVERWRITE', 'FAIL')
+
+
+class BulkImportManager(BaseManager):
+    """
+    Applies clients, realm roles and groups through Keycloak partialImport.
+    
+    Client scopes are not supported by partialImport, so they stay with
+    ClientScopeManager; this step runs once they exist. The per-resource
+    managers still run afterwards and only reconcile what the import does
+    not cover (scope assignments on existing clients, the user profile).
+    """
+    
+    dependencies = ('client_scopes',)
+    
+    # Orchestrator steps whose resources this manager imports
+    IMPORTS_FOR = ('clients', 'user_profile')
+    
+    def __init__(self, keycloak_client, constants, if_resource_exists: str = 'SKIP'):
+        super().__init__(keycloak_client, constants)
+        if if_resource_exists not in IF_RESOURCE_EXISTS_POLICIES:
+            raise ValueError(
+                f"ifResourceExists must be one of {IF_RESOURCE_EXISTS_POLICIES}"
+            )
+        self.if_resource_exists = if_resource_exists
+    
+    def create(self) -> bool:
+        """Import all missing (or, with OVERWRITE, all) resources at once."""
+        try:
+            self.logger.start_operation("bulk import")
+            return self.apply(self.plan())
+        
+        except Exception as e:
+            return self._handle_api_error("Bulk import", e)
+    
+    def plan(self, snapshot: Optional[RealmSnapshot] = None) -> Plan:
+        """Plan a single partialImport request, or none when nothing is missing."""
+        plan = Plan("bulk import")
+        payload = self.build_payload()
+        
+        counts = {
+            'clients': len(payload['clients']),
+            'roles': len(payload['roles']['realm']),
+            'groups': len(payload['groups'])
+        }
+        if not any(counts.values()):
+            return plan
+        
+        summary = ', '.join(f"{count} {kind}" for kind, count in counts.items() if count)
+        plan.add(
+            ChangeType.CREATE, 'partial-import',
+            f"{self.realm_name}: {summary}, ifResourceExists={self.if_resource_exists}",
+            partial(self._import, payload)
+        )
+        return plan
+    
+    def destroy(self) -> bool:
+        """Imported resources are removed by their own managers."""
+        self.logger.skip_operation(
+            "Bulk import destruction", "Handled by resource managers"
+        )
+        return True
+    
+    def validate(self, snapshot: Optional[RealmSnapshot] = None) -> bool:
+        """Imported resources are validated by their own managers."""
+        return True
+    
+    def build_payload(self) -> Dict[str, Any]:
+        """
+        Build the partialImport body from the desired state.
+        
+        With SKIP only resources missing from the realm are included, so a
+        converged realm yields an empty payload and no request at all.
+        """
+        clients = self.constants.CLIENTS
+        roles = self.constants.DEFAULT_ROLES
+        groups = self.constants.DEFAULT_GROUPS
+        
+        if self.if_resource_exists == 'SKIP':
+            index = self.keycloak_client.index
+            clients = self._missing(clients, 'clientId', index.ids(self.realm_name, 'clients'))
+            roles = self._missing(roles, 'name', index.ids(self.realm_name, 'roles'))
+            groups = self._missing(groups, 'name', index.ids(self.realm_name, 'groups'))
+        
+        return {
+            'ifResourceExists': self.if_resource_exists,
+            'clients': clients,
+            'roles': {'realm': roles},
+            'groups': groups
+        }
+    
+    def _missing(
+        self,
+        items: List[Dict[str, Any]],
+        key: str,
+        existing: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """Items whose name is not in the realm yet."""
+        return [item for item in items if item[key] not in existing]
+    
+    async def _import(self, payload: Dict[str, Any]) -> bool:
+        """Send the import and log each resource's outcome."""
+        result = await self.aio.partial_import(self.realm_name, payload)
+        if result is None:
+            self.logger.error("Partial import failed")
+            return False
+        
+        for item in result.get('results', []):
+            kind = item.get('resourceType', 'resource').replace('_', ' ')
+            resource = f"{kind.capitalize()} '{item.get('resourceName')}'"
+            action = item.get('action')
+            if action == 'ADDED':
+                self.logger.success(f"{resource} created")
+            elif action == 'OVERWRITTEN':
+                self.logger.success(f"{resource} overwritten")
+            elif action == 'SKIPPED':
+                self.logger.skip_operation(f"Import {resource}", "Already exists")
+        
+        self.logger.info(
+            f"Partial import: {result.get('added', 0)} added, "
+            f"{result.get('overwritten', 0)} overwritten, "
+            f"{result.get('skipped', 0)} skipped"
+        )
+        return True
@@ -0,0 +1,345 @@
+"""
+Client Manager
+Reconciles every client defined in the constants from one realm listing
+"""
+from functools import partial
+from typing import Dict, Any, Iterable, List, Optional, Set
+from actions.base_manager import BaseManager
+from actions.plan import Plan, ChangeType, diff_fields
+from utils.fingerprint import fingerprint, stored_fingerprint
+from utils.realm_snapshot import RealmSnapshot
+
+
+class ClientManager(BaseManager):
+    """Manages OIDC clients from a list of client definitions."""
+    
+    dependencies = ('client_scopes',)
+    
+    # Client scope assignment kinds, as in '{kind}ClientScopes'
+    SCOPE_KINDS = ('default', 'optional')
+    
+    # Definition keys reconciled through their own endpoints, not the client PUT
+    UNMANAGED_FIELDS = ('defaultClientScopes', 'optionalClientScopes')
+    
+    def __init__(
+        self,
+        keycloak_client,
+        constants,
+        clients: Optional[List[Dict[str, Any]]] = None,
+        secret_version: str = '',
+        **kwargs
+    ):
+        super().__init__(keycloak_client, constants, **kwargs)
+        # Stands in for client secrets in the fingerprint, which omits them
+        self.secret_version = secret_version
+        if clients is None:
+            self.clients = constants.CLIENTS_BY_ID
+        else:
+            self.clients = {client['clientId']: client for client in clients}
+    
+    def create(self) -> bool:
+        """Create and configure all clients."""
+        try:
+            self.logger.start_operation("Client creation")
+            
+            existing, created = list(self.clients), []
+            if self._creates_optimistically():
+                existing = self._create_optimistically('client', {
+                    client_id: partial(self._post_client, client_id)
+                    for client_id in self.clients
+                })
+                if existing is None:
+                    return False
+                created = [c for c in self.clients if c not in existing]
+            
+            # Reconcile only the clients that were already there
+            if existing:
+                plan = self.plan(existing)
+                if not self.apply(plan):
+                    return False
+                created += [
+                    change.name for change in plan.changes
+                    if change.change_type == ChangeType.CREATE
+                    and change.resource_type == 'client'
+                ]
+            
+            # Keycloak assigns the scopes listed in the POST body; one more
+            # listing catches what it did not, instead of reads per client
+            if created and not self.apply(self.plan(created)):
+                return False
+            
+            self.logger.success(f"{len(self.clients)} client(s) configured")
+            return True
+        
+        except Exception as e:
+            return self._handle_api_error("Client creation", e)
+    
+    def plan(
+        self,
+        client_ids: Optional[Iterable[str]] = None,
+        snapshot: Optional[RealmSnapshot] = None
+    ) -> Plan:
+        """Plan client creation, drifted settings and scope assignment changes."""
+        plan = Plan("clients")
+        
+        # One paged listing covers every client, whatever their number
+        if snapshot is not None:
+            current = snapshot.clients
+        else:
+            current = {
+                client['clientId']: client
+                for client in self.keycloak_client.get_clients(self.realm_name) or []
+            }
+        
+        for client_id in (self.clients if client_ids is None else client_ids):
+            existing_client = current.get(client_id)
+            
+            if not existing_client:
+                plan.add(
+                    ChangeType.CREATE, 'client', client_id,
+                    partial(self._create_client, client_id)
+                )
+                continue
+            
+            # Covers the scope lists too, assignments are skipped with it
+            digest = fingerprint([self.clients[client_id], self.secret_version])
+            if self._fingerprint_matches(existing_client, digest):
+                continue
+            
+            client_uuid = existing_client['id']
+            desired = self._managed_client_config(client_id)
+            diff = diff_fields(existing_client, desired)
+            # A secret may read back masked and never show in a diff: send
+            # it whenever the recorded fingerprint is out of date
+            if 'secret' in desired and stored_fingerprint(existing_client) != digest:
+                diff.setdefault('secret', (None, desired['secret']))
+            if diff:
+                plan.add(
+                    ChangeType.UPDATE, 'client', client_id,
+                    partial(
+                        self.aio.update_client, self.realm_name, client_uuid,
+                        {key: desired[key] for key in diff}
+                    ),
+                    diff
+                )
+            
+            # The client representation already lists assigned scope names
+            self._plan_scope_assignments(plan, client_id, client_uuid, {
+                kind: existing_client.get(f'{kind}ClientScopes', [])
+                for kind in self.SCOPE_KINDS
+            })
+            self._stamp_fingerprint(
+                plan, client_id, existing_client, digest,
+                partial(self.aio.update_client, self.realm_name, client_uuid)
+            )
+        
+        return plan
+    
+    def destroy(self) -> bool:
+        """Destroy all managed clients."""
+        try:
+            self.logger.rollback_operation("Client destruction")
+            
+            client_ids = self.keycloak_client.index.ids(self.realm_name, 'clients')
+            to_delete = [
+                (client_id, client_ids[client_id])
+                for client_id in self.clients
+                if client_id in client_ids
+            ]
+            
+            for client_id in self.clients:
+                if client_id not in client_ids:
+                    self.logger.skip_operation(
+                        f"Client '{client_id}' destruction", "Does not exist"
+                    )
+            if not to_delete:
+                return True
+            
+            results = self._run_concurrently(
+                self.aio.delete_client(self.realm_name, client_uuid)
+                for _, client_uuid in to_delete
+            )
+            
+            success = True
+            for (client_id, _), deleted in zip(to_delete, results):
+                if deleted:
+                    self.logger.success(f"Client '{client_id}' deleted")
+                else:
+                    self.logger.error(f"Failed to delete client '{client_id}'")
+                    success = False
+            return success
+        
+        except Exception as e:
+            return self._handle_api_error("Client destruction", e)
+    
+    def validate(self, snapshot: Optional[RealmSnapshot] = None) -> bool:
+        """Validate every client against its definition."""
+        try:
+            self.logger.start_operation("Client validation")
+            
+            snapshot = self._get_snapshot(snapshot)
+            validations = [
+                self._validate_client(snapshot, client_id)
+                for client_id in self.clients
+            ]
+            
+            if all(validations):
+                self.logger.success("Client validation passed")
+                return True
+            else:
+                self.logger.error("Client validation failed")
+                return False
+        
+        except Exception as e:
+            return self._handle_api_error("Client validation", e)
+    
+    def _managed_client_config(self, client_id: str) -> Dict[str, Any]:
+        """Client settings kept in sync on existing clients."""
+        return {
+            key: value
+            for key, value in self.clients[client_id].items()
+            if key not in self.UNMANAGED_FIELDS
+        }
+    
+    def _desired_scopes(self, client_id: str) -> Dict[str, Set[str]]:
+        """Client scope names to assign, by kind, from the client definition."""
+        return {
+            kind: set(self.clients[client_id].get(f'{kind}ClientScopes', []))
+            for kind in self.SCOPE_KINDS
+        }
+    
+    def _plan_scope_assignments(
+        self,
+        plan: Plan,
+        client_id: str,
+        client_uuid: str,
+        assigned: Dict[str, Iterable[str]]
+    ):
+        """
+        Add the assignment changes that make each kind match the definition.
+        
+        Adds and removals are set differences against the scope names
+        assigned now, so nothing already in place is sent again. A scope
+        moving between default and optional becomes one change that
+        unassigns it before assigning it as the other kind.
+        """
+        desired = self._desired_scopes(client_id)
+        current = {kind: set(assigned[kind]) for kind in self.SCOPE_KINDS}
+        adds = {kind: desired[kind] - current[kind] for kind in self.SCOPE_KINDS}
+        removes = {kind: current[kind] - desired[kind] for kind in self.SCOPE_KINDS}
+        if not any(adds.values()) and not any(removes.values()):
+            return
+        
+        scope_ids = self._get_scope_ids()
+        
+        for kind in self.SCOPE_KINDS:
+            other = 'optional' if kind == 'default' else 'default'
+            for scope_name in sorted(adds[kind]):
+                if scope_name not in scope_ids:
+                    self.logger.warning(
+                        f"Client scope '{scope_name}' not found, not assigning"
+                    )
+                    continue
+                name = f"{client_id}/{scope_name}"
+                scope_id = scope_ids[scope_name]
+                if scope_name in removes[other]:
+                    removes[other].discard(scope_name)
+                    plan.add(
+                        ChangeType.UPDATE, 'client-scope-assignment', name,
+                        partial(self._move_scope, client_uuid, scope_id, other, kind),
+                        {'kind': (other, kind)},
+                        resource=client_id
+                    )
+                else:
+                    plan.add(
+                        ChangeType.CREATE, f'{kind}-client-scope', name,
+                        partial(
+                            self._assigner(kind), self.realm_name,
+                            client_uuid, scope_id
+                        ),
+                        resource=client_id
+                    )
+        
+        for kind in self.SCOPE_KINDS:
+            for scope_name in sorted(removes[kind]):
+                if scope_name in scope_ids:
+                    plan.add(
+                        ChangeType.DELETE, f'{kind}-client-scope',
+                        f"{client_id}/{scope_name}",
+                        partial(
+                            self._unassigner(kind), self.realm_name,
+                            client_uuid, scope_ids[scope_name]
+                        ),
+                        resource=client_id
+                    )
+    
+    def _assigner(self, kind: str):
+        """Async API call assigning a scope of the given kind."""
+        if kind == 'default':
+            return self.aio.assign_default_client_scope
+        return self.aio.assign_optional_client_scope
+    
+    def _unassigner(self, kind: str):
+        """Async API call removing a scope of the given kind."""
+        if kind == 'default':
+            return self.aio.unassign_default_client_scope
+        return self.aio.unassign_optional_client_scope
+    
+    async def _move_scope(
+        self,
+        client_uuid: str,
+        scope_id: str,
+        from_kind: str,
+        to_kind: str
+    ) -> bool:
+        """Reassign a scope as the other kind (a scope holds only one)."""
+        if not await self._unassigner(from_kind)(self.realm_name, client_uuid, scope_id):
+            return False
+        return await self._assigner(to_kind)(self.realm_name, client_uuid, scope_id)
+    
+    def _get_scope_ids(self) -> Dict[str, str]:
+        """Resolve client scope IDs by name."""
+        # Served from the run's index: at most one listing per realm
+        return self.keycloak_client.index.ids(self.realm_name, 'client-scopes')
+    
+    async def _create_client(self, client_id: str) -> bool:
+        """Create the client with its client scopes."""
+        return bool(await self._post_client(client_id))
+    
+    async def _post_client(self, client_id: str) -> Optional[bool]:
+        """
+        POST the client.
+        
+        True when created, False when it already existed, None on failure.
+        """
+        # An existing client is planned by clientId, its ID is not needed
+        _, created = await self.aio.create_resource(
+            self.realm_name, 'clients', self.clients[client_id],
+            resolve_existing=False
+        )
+        
+        if created is None:
+            self.logger.error(f"Failed to create client '{client_id}'")
+            return None
+        if not created:
+            return False
+        
+        self.logger.success(f"Client '{client_id}' created")
+        return True
+    
+    def _validate_client(self, snapshot: Optional[RealmSnapshot], client_id: str) -> bool:
+        """Validate one client's settings against its definition."""
+        client = snapshot.get_client(client_id) if snapshot else None
+        if not client:
+            self.logger.error(f"Client '{client_id}' not found")
+            return False
+        
+        diff = diff_fields(client, self._managed_client_config(client_id))
+        for key in sorted(diff):
+            # Values are not printed, a definition may hold a client secret
+            self.logger.error(f"✗ {client_id}: '{key}' differs from definition")
+        
+        if diff:
+            return False
+        self.logger.debug(f"✓ Client '{client_id}' valid")
+        return True
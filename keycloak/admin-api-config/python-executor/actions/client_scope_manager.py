@@ -2,22 +2,40 @@
 Client Scope Manager
 Handles OIDC client scopes creation and management
 """
-from typing import Dict, Any, List
+from functools import partial
+from typing import Dict, Any, List, Optional
 from actions.base_manager import BaseManager
+from actions.plan import Plan, ChangeType, diff_fields
+from utils.fingerprint import fingerprint
+from utils.realm_snapshot import RealmSnapshot
 
 
 class ClientScopeManager(BaseManager):
     """Manages OIDC client scopes for business requirements."""
     
+    dependencies = ('realm',)
+    
+    def __init__(self, keycloak_client, constants, prune_mappers: bool = False, **kwargs):
+        super().__init__(keycloak_client, constants, **kwargs)
+        # Delete mappers on managed scopes that are not in CLIENT_SCOPES
+        self.prune_mappers = prune_mappers
+    
     def create(self) -> bool:
         """Create all required client scopes."""
         try:
             self.logger.start_operation("client scopes creation")
             
-            success = True
-            for scope_name, scope_config in self.constants.CLIENT_SCOPES.items():
-                if not self._create_single_scope(scope_name, scope_config):
-                    success = False
+            if self._creates_optimistically():
+                existing = self._create_optimistically('client-scope', {
+                    scope_name: partial(self._post_scope, scope_name, scope_config)
+                    for scope_name, scope_config in self.constants.CLIENT_SCOPES.items()
+                })
+                # Scopes that already existed (built-ins) still get planned
+                success = existing is not None and (
+                    not existing or self.apply(self.plan(existing))
+                )
+            else:
+                success = self.apply(self.plan())
             
             if success:
                 self.logger.success("All client scopes created successfully")
@@ -29,15 +47,123 @@ class ClientScopeManager(BaseManager):
         except Exception as e:
             return self._handle_api_error("Client scopes creation", e)
     
+    def plan(
+        self,
+        scope_names: Optional[List[str]] = None,
+        snapshot: Optional[RealmSnapshot] = None
+    ) -> Plan:
+        """Plan missing scopes, drifted scope settings and mapper changes."""
+        plan = Plan("client scopes")
+        wanted = self.constants.CLIENT_SCOPES
+        if scope_names is not None:
+            wanted = {name: wanted[name] for name in scope_names}
+        
+        # One listing returns every scope together with its mappers
+        if snapshot is not None:
+            existing = snapshot.client_scopes
+        else:
+            existing = {
+                scope['name']: scope
+                for scope in self.keycloak_client.get_client_scopes(self.realm_name) or []
+            }
+        
+        for scope_name, scope_config in wanted.items():
+            scope = existing.get(scope_name)
+            if not scope:
+                plan.add(
+                    ChangeType.CREATE, 'client-scope', scope_name,
+                    partial(self._create_single_scope, scope_name, scope_config)
+                )
+                continue
+            
+            # Pruning is part of the desired state: turning it on re-checks
+            digest = fingerprint([scope_config, self.prune_mappers])
+            if self._fingerprint_matches(scope, digest):
+                continue
+            
+            scope_data = self._scope_data(scope_config)
+            diff = diff_fields(scope, scope_data)
+            if diff:
+                plan.add(
+                    ChangeType.UPDATE, 'client-scope', scope_name,
+                    partial(
+                        self.aio.update_client_scope,
+                        self.realm_name, scope['id'], scope_data
+                    ),
+                    diff
+                )
+            
+            self._plan_mappers(plan, scope_name, scope, scope_config)
+            self._stamp_fingerprint(
+                plan, scope_name, scope, digest,
+                partial(self.aio.update_client_scope, self.realm_name, scope['id'])
+            )
+        
+        return plan
+    
+    def _plan_mappers(
+        self,
+        plan: Plan,
+        scope_name: str,
+        scope: Dict[str, Any],
+        scope_config: Dict[str, Any]
+    ):
+        """Diff a scope's mappers by name and settings."""
+        # Scope listings embed each scope's mappers, no extra GET needed
+        current = {
+            mapper['name']: mapper for mapper in scope.get('protocolMappers', [])
+        }
+        desired = {
+            mapper['name']: mapper
+            for mapper in scope_config.get('protocolMappers', [])
+        }
+        
+        for mapper_name, mapper in desired.items():
+            label = f"{scope_name}/{mapper_name}"
+            existing = current.get(mapper_name)
+            if not existing:
+                plan.add(
+                    ChangeType.CREATE, 'protocol-mapper', label,
+                    partial(self._create_protocol_mapper, scope['id'], mapper),
+                    resource=scope_name
+                )
+                continue
+            
+            diff = diff_fields(existing, mapper)
+            if diff:
+                plan.add(
+                    ChangeType.UPDATE, 'protocol-mapper', label,
+                    partial(
+                        self.aio.update_protocol_mapper, self.realm_name,
+                        scope['id'], existing['id'], mapper
+                    ),
+                    diff,
+                    resource=scope_name
+                )
+        
+        if self.prune_mappers:
+            for mapper_name, existing in current.items():
+                if mapper_name not in desired:
+                    plan.add(
+                        ChangeType.DELETE, 'protocol-mapper',
+                        f"{scope_name}/{mapper_name}",
+                        partial(
+                            self.aio.delete_protocol_mapper, self.realm_name,
+                            scope['id'], existing['id']
+                        ),
+                        resource=scope_name
+                    )
+    
     def destroy(self) -> bool:
         """Destroy all created client scopes."""
         try:
             self.logger.rollback_operation("client scopes destruction")
             
-            success = True
-            for scope_name in self.constants.CLIENT_SCOPES.keys():
-                if not self._destroy_single_scope(scope_name):
-                    success = False
+            results = self._run_concurrently(
+                self._destroy_single_scope(scope_name)
+                for scope_name in self.constants.CLIENT_SCOPES.keys()
+            )
+            success = all(results)
             
             if success:
                 self.logger.success("All client scopes destroyed successfully")
@@ -49,14 +175,21 @@ class ClientScopeManager(BaseManager):
         except Exception as e:
             return self._handle_api_error("Client scopes destruction", e)
     
-    def validate(self) -> bool:
+    def validate(self, snapshot: Optional[RealmSnapshot] = None) -> bool:
         """Validate all client scopes exist and are configured correctly."""
         try:
             self.logger.start_operation("client scopes validation")
             
+            snapshot = self._get_snapshot(snapshot)
+            if not snapshot:
+                self.logger.error(f"Realm '{self.realm_name}' not found")
+                return False
+            
             validations = []
             for scope_name in self.constants.CLIENT_SCOPES.keys():
-                validations.append(self._validate_single_scope(scope_name))
+                validations.append(
+                    self._validate_single_scope(scope_name, snapshot)
+                )
             
             if all(validations):
                 self.logger.success("All client scopes validation passed")
@@ -68,73 +201,91 @@ class ClientScopeManager(BaseManager):
         except Exception as e:
             return self._handle_api_error("Client scopes validation", e)
     
-    def _create_single_scope(self, scope_name: str, scope_config: Dict[str, Any]) -> bool:
+    async def _create_single_scope(
+        self,
+        scope_name: str,
+        scope_config: Dict[str, Any]
+    ) -> bool:
         """Create a single client scope with protocol mappers."""
+        return await self._post_scope(scope_name, scope_config) is not None
+    
+    async def _post_scope(
+        self,
+        scope_name: str,
+        scope_config: Dict[str, Any]
+    ) -> Optional[bool]:
+        """
+        POST a scope, then its mappers if it was new.
+        
+        True when created, False when it already existed, None on failure.
+        """
         try:
-            # Check if scope already exists
-            existing_scope = self.keycloak_client.get_client_scope_by_name(
-                self.realm_name, scope_name
+            # Create scope (without protocol mappers first); an existing
+            # scope is planned from the listing, no need to resolve its ID
+            scope_id, created = await self.aio.create_resource(
+                self.realm_name, 'client-scopes', self._scope_data(scope_config),
+                resolve_existing=False
             )
             
-            if existing_scope:
-                self.logger.skip_operation(
-                    f"Client scope '{scope_name}'",
-                    "Already exists"
-                )
-                scope_id = existing_scope['id']
-            else:
-                # Create scope (without protocol mappers first)
-                scope_data = {
-                    'name': scope_config['name'],
-                    'description': scope_config['description'],
-                    'protocol': scope_config['protocol'],
-                    'attributes': scope_config['attributes']
-                }
-                
-                scope_id = self.keycloak_client.create_client_scope(
-                    self.realm_name, scope_data
-                )
-                
-                if not scope_id:
-                    self.logger.error(f"Failed to create scope '{scope_name}'")
-                    return False
-                
-                self.logger.success(f"Client scope '{scope_name}' created")
+            if created is None:
+                self.logger.error(f"Failed to create scope '{scope_name}'")
+                return None
+            if not created:
+                return False
+            
+            self.logger.success(f"Client scope '{scope_name}' created")
             
-            # Create protocol mappers
-            if 'protocolMappers' in scope_config:
-                for mapper in scope_config['protocolMappers']:
-                    if not self._create_protocol_mapper(scope_id, mapper):
-                        self.logger.warning(
-                            f"Failed to create mapper '{mapper['name']}' "
-                            f"for scope '{scope_name}'"
-                        )
+            # Create protocol mappers concurrently once the scope exists
+            mappers = scope_config.get('protocolMappers', [])
+            results = await self.aio.gather(*(
+                self._create_protocol_mapper(scope_id, mapper)
+                for mapper in mappers
+            ))
+            for mapper, created in zip(mappers, results):
+                if not created:
+                    self.logger.warning(
+                        f"Failed to create mapper '{mapper['name']}' "
+                        f"for scope '{scope_name}'"
+                    )
             
             return True
             
         except Exception as e:
             self.logger.error(f"Error creating scope '{scope_name}': {str(e)}")
-            return False
+            return None
     
-    def _create_protocol_mapper(self, scope_id: str, mapper_config: Dict[str, Any]) -> bool:
+    def _scope_data(self, scope_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Scope representation without its protocol mappers."""
+        return {
+            'name': scope_config['name'],
+            'description': scope_config.get('description', ''),
+            'protocol': scope_config['protocol'],
+            'attributes': scope_config.get('attributes', {})
+        }
+    
+    async def _create_protocol_mapper(
+        self,
+        scope_id: str,
+        mapper_config: Dict[str, Any]
+    ) -> bool:
         """Create a protocol mapper for a client scope."""
         try:
-            return self.keycloak_client.create_protocol_mapper(
+            return await self.aio.create_protocol_mapper(
                 self.realm_name, scope_id, mapper_config
             )
         except Exception as e:
             self.logger.error(f"Error creating protocol mapper: {str(e)}")
             return False
     
-    def _destroy_single_scope(self, scope_name: str) -> bool:
+    async def _destroy_single_scope(self, scope_name: str) -> bool:
         """Destroy a single client scope."""
         try:
-            # Get scope by name
-            scope = self.keycloak_client.get_client_scope_by_name(
+            # Resolve scope ID by name
+            scope_id = await self.aio.get_client_scope_id(
                 self.realm_name, scope_name
             )
             
-            if not scope:
+            if not scope_id:
                 self.logger.skip_operation(
                     f"Client scope '{scope_name}' destruction",
                     "Does not exist"
@@ -142,9 +293,7 @@ class ClientScopeManager(BaseManager):
                 return True
             
             # Delete scope
-            if self.keycloak_client.delete_client_scope(
-                self.realm_name, scope['id']
-            ):
+            if await self.aio.delete_client_scope(self.realm_name, scope_id):
                 self.logger.success(f"Client scope '{scope_name}' deleted")
                 return True
             else:
@@ -155,12 +304,14 @@ class ClientScopeManager(BaseManager):
             self.logger.error(f"Error destroying scope '{scope_name}': {str(e)}")
             return False
     
-    def _validate_single_scope(self, scope_name: str) -> bool:
+    def _validate_single_scope(
+        self,
+        scope_name: str,
+        snapshot: RealmSnapshot
+    ) -> bool:
         """Validate a single client scope."""
         try:
-            scope = self.keycloak_client.get_client_scope_by_name(
-                self.realm_name, scope_name
-            )
+            scope = snapshot.get_client_scope(scope_name)
             
             if not scope:
                 self.logger.error(f"Client scope '{scope_name}' not found")
@@ -171,7 +322,7 @@ class ClientScopeManager(BaseManager):
             validations = [
                 scope.get('name') == expected['name'],
                 scope.get('protocol') == expected['protocol'],
-                scope.get('description') == expected['description']
+                scope.get('description', '') == expected.get('description', '')
             ]
             
             if all(validations):
@@ -187,13 +338,5 @@ class ClientScopeManager(BaseManager):
     
     def get_scope_ids(self) -> Dict[str, str]:
         """Get all client scope IDs mapped by name."""
-        scope_ids = {}
-        
-        for scope_name in self.constants.CLIENT_SCOPES.keys():
-            scope = self.keycloak_client.get_client_scope_by_name(
-                self.realm_name, scope_name
-            )
-            if scope:
-                scope_ids[scope_name] = scope['id']
-        
-        return scope_ids
+        # Served from the run's index: at most one listing per realm
+        return self.keycloak_client.index.ids(self.realm_name, 'client-scopes')
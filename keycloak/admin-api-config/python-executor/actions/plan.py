@@ -0,0 +1,123 @@
+"""
+Configuration Plan
+Typed diff between the desired and the current Keycloak state
+"""
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Keycloak never returns stored secrets, it echoes this mask instead
+SECRET_MASK = '**********'
+
+
+class ChangeType(Enum):
+    """Kind of write a change performs."""
+    CREATE = '+'
+    UPDATE = '~'
+    DELETE = '-'
+
+
+@dataclass
+class Change:
+    """A single write required to converge one resource."""
+    change_type: ChangeType
+    resource_type: str
+    name: str
+    action: Callable[[], Awaitable[bool]] = field(repr=False, compare=False)
+    diff: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    # Resource the change belongs to (its fingerprint waits for it)
+    resource: str = ''
+    
+    def describe(self) -> str:
+        """One-line description; only field names, values may be secrets."""
+        text = (
+            f"{self.change_type.value} {self.change_type.name.lower()} "
+            f"{self.resource_type} '{self.name}'"
+        )
+        if self.diff:
+            text += f" ({', '.join(sorted(self.diff))})"
+        return text
+
+
+class Plan:
+    """Ordered set of changes computed for one configuration component."""
+    
+    def __init__(self, component: str):
+        self.component = component
+        self.changes: List[Change] = []
+        # Resource → fingerprint write, run after all its changes succeeded
+        self.stamps: Dict[str, Callable[[], Awaitable[bool]]] = {}
+    
+    def add(
+        self,
+        change_type: ChangeType,
+        resource_type: str,
+        name: str,
+        action: Callable[[], Awaitable[bool]],
+        diff: Optional[Dict[str, Tuple[Any, Any]]] = None,
+        resource: Optional[str] = None
+    ) -> Change:
+        """Record a change and return it."""
+        change = Change(
+            change_type, resource_type, name, action, diff or {}, resource or name
+        )
+        self.changes.append(change)
+        return change
+    
+    def stamp(self, resource: str, action: Callable[[], Awaitable[bool]]):
+        """Record a resource's fingerprint once its changes have applied."""
+        self.stamps[resource] = action
+    
+    @property
+    def is_empty(self) -> bool:
+        return not self.changes
+    
+    def log(self, logger):
+        """Print the plan through a PadminiLogger."""
+        if self.is_empty:
+            logger.info(f"📋 Plan for {self.component}: no changes")
+        else:
+            logger.info(
+                f"📋 Plan for {self.component}: {len(self.changes)} change(s)"
+            )
+            for change in self.changes:
+                logger.info(f"   {change.describe()}")
+        
+        if self.stamps:
+            logger.info(f"   {len(self.stamps)} fingerprint(s) to record")
+
+
+def diff_fields(
+    current: Dict[str, Any],
+    desired: Dict[str, Any]
+) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Compare desired fields against the current representation.
+    
+    Only keys present in ``desired`` are considered, since Keycloak returns
+    many server-managed fields. Nested dicts are compared as subsets and
+    lists ignore ordering.
+    """
+    diff = {}
+    for key, value in desired.items():
+        actual = current.get(key)
+        if not values_match(actual, value):
+            diff[key] = (actual, value)
+    return diff
+
+
+def values_match(actual: Any, desired: Any) -> bool:
+    """Whether a current value satisfies a desired value."""
+    if isinstance(desired, dict):
+        return isinstance(actual, dict) and all(
+            values_match(actual.get(key), value)
+            for key, value in desired.items()
+        )
+    if isinstance(desired, list):
+        return (
+            isinstance(actual, list)
+            and sorted(map(repr, actual)) == sorted(map(repr, desired))
+        )
+    if actual == SECRET_MASK and isinstance(desired, str):
+        return True
+    return actual == desired
@@ -1 +0,0 @@
-# PPCS client package
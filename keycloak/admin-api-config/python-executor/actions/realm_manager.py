@@ -2,56 +2,103 @@
 Realm Manager
 Handles realm creation, configuration, and destruction
 """
+from functools import partial
 from typing import Dict, Any, Optional
 from actions.base_manager import BaseManager
+from actions.plan import Plan, ChangeType, diff_fields
+from utils.fingerprint import fingerprint, stored_fingerprint
+from utils.realm_snapshot import RealmSnapshot
 
 
 class RealmManager(BaseManager):
     """Manages Keycloak realm operations."""
     
+    # Realm settings checked by validate(), when the desired state sets them
+    VALIDATED_PROPERTIES = (
+        'enabled', 'displayName', 'registrationAllowed', 'verifyEmail', 'sslRequired'
+    )
+    
+    def __init__(
+        self,
+        keycloak_client,
+        constants,
+        smtp_config: Optional[Dict[str, Any]] = None,
+        smtp_secret_version: str = '',
+        **kwargs
+    ):
+        super().__init__(keycloak_client, constants, **kwargs)
+        # Realm smtpServer settings, from the orchestrator's environment
+        self.smtp_config = smtp_config
+        # Stands in for the password in the fingerprint, which omits it
+        self.smtp_secret_version = smtp_secret_version
+    
     def create(self) -> bool:
         """Create and configure the Padmini Systems realm."""
         try:
             self.logger.start_operation("realm creation")
             
-            # Check if realm already exists
-            existing_realm = self.keycloak_client.get_realm(self.realm_name)
-            if existing_realm:
-                self.logger.skip_operation(
-                    "Realm creation",
-                    f"Realm '{self.realm_name}' already exists"
-                )
-                return self._update_realm_config()
-            
-            # Prepare realm configuration
-            realm_config = self._prepare_realm_config()
+            if self.optimistic_create:
+                # POST first; only an existing realm needs to be read
+                if not self.keycloak_client.create_realm(self._prepare_realm_config()):
+                    self.logger.error(f"Failed to create realm '{self.realm_name}'")
+                    return False
+                if self.realm_name in self.keycloak_client.created_realms:
+                    self.keycloak_client.record_applied(1)
+                    self.logger.success(f"Realm '{self.realm_name}' created")
+                    return True
             
-            # Create realm
-            if self.keycloak_client.create_realm(realm_config):
-                self.logger.success(f"Realm '{self.realm_name}' created")
-                return True
-            else:
-                self.logger.error("Failed to create realm")
-                return False
+            return self.apply(self.plan())
                 
         except Exception as e:
             return self._handle_api_error("Realm creation", e)
     
+    def plan(self, snapshot: Optional[RealmSnapshot] = None) -> Plan:
+        """Plan realm creation or an update of the drifted settings only."""
+        plan = Plan("realm")
+        realm_config = self._prepare_realm_config()
+        
+        if snapshot is not None:
+            existing_realm = snapshot.realm
+        else:
+            existing_realm = self.keycloak_client.get_realm(self.realm_name)
+        if not existing_realm:
+            plan.add(
+                ChangeType.CREATE, 'realm', self.realm_name,
+                partial(self.aio.create_realm, realm_config)
+            )
+            return plan
+        
+        # The realm id is immutable once created
+        desired = {k: v for k, v in realm_config.items() if k != 'id'}
+        digest = fingerprint([desired, self.smtp_secret_version])
+        if self._fingerprint_matches(existing_realm, digest):
+            return plan
+        
+        diff = diff_fields(existing_realm, desired)
+        # The SMTP password reads back masked and never shows in a diff:
+        # send smtpServer whenever the recorded fingerprint is out of date
+        if 'smtpServer' in desired and stored_fingerprint(existing_realm) != digest:
+            diff.setdefault('smtpServer', (None, desired['smtpServer']))
+        if diff:
+            changed = {key: desired[key] for key in diff}
+            plan.add(
+                ChangeType.UPDATE, 'realm', self.realm_name,
+                partial(self.aio.update_realm, self.realm_name, changed),
+                diff
+            )
+        self._stamp_fingerprint(
+            plan, self.realm_name, existing_realm, digest,
+            partial(self.aio.update_realm, self.realm_name)
+        )
+        return plan
+    
     def destroy(self) -> bool:
         """Destroy the realm."""
         try:
             self.logger.rollback_operation("realm destruction")
             
-            # Check if realm exists
-            existing_realm = self.keycloak_client.get_realm(self.realm_name)
-            if not existing_realm:
-                self.logger.skip_operation(
-                    "Realm destruction",
-                    f"Realm '{self.realm_name}' does not exist"
-                )
-                return True
-            
-            # Delete realm
+            # One DELETE; a realm that is already gone answers 404,
+            # which counts as deleted
             if self.keycloak_client.delete_realm(self.realm_name):
                 self.logger.success(f"Realm '{self.realm_name}' deleted")
                 return True
@@ -62,25 +109,23 @@ class RealmManager(BaseManager):
         except Exception as e:
             return self._handle_api_error("Realm destruction", e)
     
-    def validate(self) -> bool:
+    def validate(self, snapshot: Optional[RealmSnapshot] = None) -> bool:
         """Validate realm configuration."""
         try:
             self.logger.start_operation("realm validation")
             
             # Get realm configuration
-            realm = self.keycloak_client.get_realm(self.realm_name)
+            snapshot = self._get_snapshot(snapshot)
+            realm = snapshot.realm if snapshot else None
             if not realm:
                 self.logger.error(f"Realm '{self.realm_name}' not found")
                 return False
             
-            # Validate key properties
+            # Validate key properties against the desired realm settings
+            desired = self.constants.REALM_CONFIG
             validations = [
-                self._validate_property(realm, 'enabled', True),
-                self._validate_property(realm, 'displayName', 
-                                      self.constants.REALM_DISPLAY_NAME),
-                self._validate_property(realm, 'registrationAllowed', True),
-                self._validate_property(realm, 'verifyEmail', True),
-                self._validate_property(realm, 'sslRequired', 'external'),
+                self._validate_property(realm, name, desired[name])
+                for name in self.VALIDATED_PROPERTIES if name in desired
             ]
             
             if all(validations):
@@ -95,36 +140,13 @@ class RealmManager(BaseManager):
     
     def _prepare_realm_config(self) -> Dict[str, Any]:
         """Prepare realm configuration with SMTP if available."""
-        # Start with base configuration
-        realm_config = self.constants.REALM_CONFIG.copy()
-        
-        # Add SMTP configuration if available
-        from config.environment import Environment
-        env = Environment()
-        smtp_config = env.get_smtp_config()
-        
-        if smtp_config:
-            realm_config['smtpServer'] = smtp_config
+        # The frozen desired state is used as is; only SMTP is layered on
+        if self.smtp_config:
             self.logger.info("SMTP configuration added to realm")
-        else:
-            self.logger.warning("SMTP configuration not available")
+            return dict(self.constants.REALM_CONFIG, smtpServer=self.smtp_config)
         
-        return realm_config
-    
-    def _update_realm_config(self) -> bool:
-        """Update existing realm configuration."""
-        try:
-            realm_config = self._prepare_realm_config()
-            
-            if self.keycloak_client.update_realm(self.realm_name, realm_config):
-                self.logger.success("Realm configuration updated")
-                return True
-            else:
-                self.logger.error("Failed to update realm configuration")
-                return False
-                
-        except Exception as e:
-            return self._handle_api_error("Realm update", e)
+        self.logger.warning("SMTP configuration not available")
+        return self.constants.REALM_CONFIG
     
     def _validate_property(
         self,
@@ -1,30 +1,37 @@
 """
 User Profile Manager
-Handles user profile configuration and mobile field setup
+Handles user profile configuration and declared profile attributes
 """
-from typing import Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, List, Optional
 from actions.base_manager import BaseManager
+from actions.plan import Plan, ChangeType, diff_fields
+from utils.realm_snapshot import RealmSnapshot
 
 
 class UserProfileManager(BaseManager):
     """Manages user profile configuration including mobile field."""
     
+    dependencies = ('realm',)
+    
     def create(self) -> bool:
         """Configure user profile with mobile field."""
         try:
             self.logger.start_operation("user profile configuration")
             
-            # Create default roles first
-            if not self._create_default_roles():
-                return False
-            
-            # Create default groups
-            if not self._create_default_groups():
+            roles_and_groups = Plan("user profile")
+            self._plan_default_roles(roles_and_groups, None)
+            self._plan_default_groups(roles_and_groups, None)
+            if not self.apply(roles_and_groups):
                 return False
             
-            # Configure user profile attributes (including mobile field)
-            if not self._configure_user_profile():
-                return False
+            # The one-shot run does not fail on a profile Keycloak refuses
+            # to update; the manual steps have been logged instead
+            attributes = Plan("user profile attributes")
+            self._plan_user_profile(attributes)
+            if not self.apply(attributes):
+                self.logger.warning("User profile attributes left to manual setup")
             
             self.logger.success("User profile configuration completed")
             return True
@@ -32,17 +39,25 @@ class UserProfileManager(BaseManager):
         except Exception as e:
             return self._handle_api_error("User profile configuration", e)
     
+    def plan(self, snapshot: Optional[RealmSnapshot] = None) -> Plan:
+        """Plan missing roles and groups and the declared profile attributes."""
+        plan = Plan("user profile")
+        self._plan_default_roles(plan, snapshot)
+        self._plan_default_groups(plan, snapshot)
+        # The user profile is not part of a snapshot, it is always read
+        self._plan_user_profile(plan)
+        return plan
+    
     def destroy(self) -> bool:
         """Destroy user profile customizations."""
         try:
             self.logger.rollback_operation("user profile destruction")
             
-            # Destroy default groups
-            if not self._destroy_default_groups():
-                return False
-            
-            # Destroy default roles
-            if not self._destroy_default_roles():
+            # Groups and roles are independent: delete both at once
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                groups = pool.submit(self._destroy_default_groups)
+                roles = pool.submit(self._destroy_default_roles)
+            if not (groups.result() and roles.result()):
                 return False
             
             self.logger.success("User profile configuration destroyed")
@@ -51,16 +66,21 @@ class UserProfileManager(BaseManager):
         except Exception as e:
             return self._handle_api_error("User profile destruction", e)
     
-    def validate(self) -> bool:
+    def validate(self, snapshot: Optional[RealmSnapshot] = None) -> bool:
         """Validate user profile configuration."""
         try:
             self.logger.start_operation("user profile validation")
             
+            snapshot = self._get_snapshot(snapshot)
+            if not snapshot:
+                self.logger.error(f"Realm '{self.realm_name}' not found")
+                return False
+            
             # Validate roles exist
-            roles_valid = self._validate_default_roles()
+            roles_valid = self._validate_default_roles(snapshot)
             
             # Validate groups exist
-            groups_valid = self._validate_default_groups()
+            groups_valid = self._validate_default_groups(snapshot)
             
             if roles_valid and groups_valid:
                 self.logger.success("User profile validation passed")
@@ -72,52 +92,67 @@ class UserProfileManager(BaseManager):
         except Exception as e:
             return self._handle_api_error("User profile validation", e)
     
-    def _create_default_roles(self) -> bool:
-        """Create default realm roles."""
-        try:
-            success = True
-            for role in self.constants.DEFAULT_ROLES:
-                result = self.keycloak_client.create_realm_role(
-                    self.realm_name, role
+    def _plan_default_roles(self, plan: Plan, snapshot: Optional[RealmSnapshot]):
+        """Plan creation of missing roles and updates of changed ones."""
+        if snapshot is not None:
+            existing = snapshot.roles
+        else:
+            existing = {
+                role['name']: role
+                for role in self.keycloak_client.get_realm_roles(self.realm_name) or []
+            }
+        
+        for role in self.constants.DEFAULT_ROLES:
+            current = existing.get(role['name'])
+            if not current:
+                plan.add(
+                    ChangeType.CREATE, 'realm-role', role['name'],
+                    partial(self.aio.create_realm_role, self.realm_name, role)
                 )
-                if result:
-                    self.logger.success(f"Role '{role['name']}' created")
-                else:
-                    self.logger.warning(f"Role '{role['name']}' may already exist")
-            
-            return success
+                continue
             
-        except Exception as e:
-            self.logger.error(f"Error creating default roles: {str(e)}")
-            return False
+            diff = diff_fields(current, role)
+            if diff:
+                plan.add(
+                    ChangeType.UPDATE, 'realm-role', role['name'],
+                    partial(
+                        self.aio.update_realm_role,
+                        self.realm_name, role['name'], role
+                    ),
+                    diff
+                )
     
-    def _create_default_groups(self) -> bool:
-        """Create default groups."""
-        try:
-            success = True
-            for group in self.constants.DEFAULT_GROUPS:
-                result = self.keycloak_client.create_group(
-                    self.realm_name, group
+    def _plan_default_groups(self, plan: Plan, snapshot: Optional[RealmSnapshot]):
+        """Plan creation of missing groups."""
+        if snapshot is not None:
+            existing = set(snapshot.groups)
+        else:
+            existing = {
+                group['name']
+                for group in self.keycloak_client.get_groups(self.realm_name) or []
+            }
+        
+        for group in self.constants.DEFAULT_GROUPS:
+            if group['name'] not in existing:
+                plan.add(
+                    ChangeType.CREATE, 'group', group['name'],
+                    partial(self._create_group, group)
                 )
-                if result:
-                    self.logger.success(f"Group '{group['name']}' created")
-                else:
-                    self.logger.warning(f"Group '{group['name']}' may already exist")
-            
-            return success
-            
-        except Exception as e:
-            self.logger.error(f"Error creating default groups: {str(e)}")
-            return False
+    
+    async def _create_group(self, group: Dict[str, Any]) -> bool:
+        """Create a group, reporting success as a boolean."""
+        return await self.aio.create_group(self.realm_name, group) is not None
     
     def _destroy_default_roles(self) -> bool:
         """Destroy default realm roles."""
         try:
             success = True
-            for role in self.constants.DEFAULT_ROLES:
-                result = self.keycloak_client.delete_realm_role(
-                    self.realm_name, role['name']
-                )
+            roles = self.constants.DEFAULT_ROLES
+            results = self._run_concurrently(
+                self.aio.delete_realm_role(self.realm_name, role['name'])
+                for role in roles
+            )
+            for role, result in zip(roles, results):
                 if result:
                     self.logger.success(f"Role '{role['name']}' deleted")
                 else:
@@ -133,20 +168,49 @@ class UserProfileManager(BaseManager):
     def _destroy_default_groups(self) -> bool:
         """Destroy default groups."""
         try:
-            # Note: Group destruction requires getting group IDs first
-            # This is a simplified implementation
-            self.logger.info("Group destruction requires manual cleanup")
-            return True
+            success = True
+            groups = [
+                (group['name'], self.keycloak_client.get_group_id(
+                    self.realm_name, group['name']
+                ))
+                for group in self.constants.DEFAULT_GROUPS
+            ]
+            
+            for group_name, group_id in groups:
+                if not group_id:
+                    self.logger.skip_operation(
+                        f"Group '{group_name}' destruction", "Does not exist"
+                    )
+            
+            existing = [(name, gid) for name, gid in groups if gid]
+            results = self._run_concurrently(
+                self.aio.delete_group(self.realm_name, group_id)
+                for _, group_id in existing
+            )
+            for (group_name, _), result in zip(existing, results):
+                if result:
+                    self.logger.success(f"Group '{group_name}' deleted")
+                else:
+                    self.logger.warning(f"Failed to delete group '{group_name}'")
+                    success = False
+            
+            return success
             
         except Exception as e:
             self.logger.error(f"Error destroying default groups: {str(e)}")
             return False
     
-    def _validate_default_roles(self) -> bool:
+    def _validate_default_roles(self, snapshot: RealmSnapshot) -> bool:
         """Validate default roles exist."""
         try:
-            # This would require implementing role lookup in KeycloakClient
-            # For now, assume validation passes
+            missing = [
+                role['name'] for role in self.constants.DEFAULT_ROLES
+                if not snapshot.get_role(role['name'])
+            ]
+            if missing:
+                self.logger.error(f"✗ Missing realm roles: {missing}")
+                return False
+            
             self.logger.debug("Role validation passed")
             return True
             
@@ -154,11 +218,17 @@ class UserProfileManager(BaseManager):
             self.logger.error(f"Error validating roles: {str(e)}")
             return False
     
-    def _validate_default_groups(self) -> bool:
+    def _validate_default_groups(self, snapshot: RealmSnapshot) -> bool:
         """Validate default groups exist."""
         try:
-            # This would require implementing group lookup in KeycloakClient
-            # For now, assume validation passes
+            missing = [
+                group['name'] for group in self.constants.DEFAULT_GROUPS
+                if not snapshot.get_group(group['name'])
+            ]
+            if missing:
+                self.logger.error(f"✗ Missing groups: {missing}")
+                return False
+            
             self.logger.debug("Group validation passed")
             return True
             
@@ -166,88 +236,65 @@ class UserProfileManager(BaseManager):
             self.logger.error(f"Error validating groups: {str(e)}")
             return False
     
-    def _configure_user_profile(self) -> bool:
-        """Configure user profile attributes including mobile field."""
+    def _plan_user_profile(self, plan: Plan):
+        """Plan adding the declared profile attributes that are missing."""
+        # Get current user profile configuration
+        current_config = self.keycloak_client.get_user_profile_config(self.realm_name)
+        
+        if not current_config:
+            self.logger.warning("Could not retrieve current user profile config")
+            self._log_manual_setup()
+            return  # Don't fail the entire process
+        
+        existing = {
+            attr.get('name') for attr in current_config.get('attributes', [])
+        }
+        missing = [
+            attr for attr in self.constants.USER_PROFILE_CONFIG.get('attributes', [])
+            if attr['name'] not in existing
+        ]
+        if not missing:
+            self.logger.debug("Profile attributes already exist in user profile")
+            return
+        
+        names = ', '.join(attr['name'] for attr in missing)
+        updated_config = self._merge_user_profile_config(current_config, missing)
+        plan.add(
+            ChangeType.UPDATE, 'user-profile', names,
+            partial(self._update_user_profile, updated_config),
+            {'attributes': (None, names)}
+        )
+    
+    async def _update_user_profile(self, updated_config: Dict[str, Any]) -> bool:
+        """Write the user profile, logging manual setup instructions on failure."""
         try:
-            self.logger.info("Configuring user profile attributes...")
-            
-            # Get current user profile configuration
-            current_config = self.keycloak_client.get_user_profile_config(self.realm_name)
-            
-            if not current_config:
-                self.logger.warning("Could not retrieve current user profile config")
-                self.logger.info("Manual setup required:")
-                self.logger.info("1. Admin Console → Realm Settings → User Profile")
-                self.logger.info("2. Add mobile attribute with validation")
-                return True  # Don't fail the entire process
-            
-            # Update user profile configuration
-            updated_config = self._merge_user_profile_config(current_config)
-            
-            if self.keycloak_client.update_user_profile_config(self.realm_name, updated_config):
+            if await self.aio.update_user_profile_config(
+                self.realm_name, updated_config
+            ):
                 self.logger.success("User profile configuration updated")
                 return True
-            else:
-                self.logger.warning("Failed to update user profile via API")
-                self.logger.info("Manual setup required:")
-                self.logger.info("1. Admin Console → Realm Settings → User Profile")
-                self.logger.info("2. Add mobile attribute with validation")
-                return True  # Don't fail the entire process
-                
+            self.logger.warning("Failed to update user profile via API")
         except Exception as e:
             self.logger.error(f"Error configuring user profile: {str(e)}")
-            self.logger.info("Manual setup required:")
-            self.logger.info("1. Admin Console → Realm Settings → User Profile")
-            self.logger.info("2. Add mobile attribute with validation")
-            return True  # Don't fail the entire process
+        self._log_manual_setup()
+        return False
     
-    def _merge_user_profile_config(self, current_config: dict) -> dict:
-        """Merge our mobile attribute configuration with existing config."""
-        try:
-            # Ensure attributes section exists
-            if 'attributes' not in current_config:
-                current_config['attributes'] = []
-            
-            # Check if mobile attribute already exists
-            mobile_exists = any(
-                attr.get('name') == 'mobile' 
-                for attr in current_config['attributes']
-            )
-            
-            if not mobile_exists:
-                # Add mobile attribute configuration
-                mobile_attr = {
-                    "name": "mobile",
-                    "displayName": "Mobile Number",
-                    "validations": {
-                        "pattern": {
-                            "pattern": "^[+]?[1-9]\\d{9,14}$",
-                            "error-message": "Enter valid mobile with country code"
-                        },
-                        "length": {
-                            "min": 10,
-                            "max": 15
-                        }
-                    },
-                    "annotations": {
-                        "inputType": "phone"
-                    },
-                    "required": {
-                        "roles": ["user"]
-                    },
-                    "permissions": {
-                        "view": ["admin", "user"],
-                        "edit": ["admin", "user"]
-                    }
-                }
-                
-                current_config['attributes'].append(mobile_attr)
-                self.logger.info("Mobile attribute configuration added")
-            else:
-                self.logger.info("Mobile attribute already exists in user profile")
-            
-            return current_config
-            
-        except Exception as e:
-            self.logger.error(f"Error merging user profile config: {str(e)}")
-            return current_config
+    def _log_manual_setup(self):
+        """Explain how to add the mobile attribute by hand."""
+        self.logger.info("Manual setup required:")
+        self.logger.info("1. Admin Console → Realm Settings → User Profile")
+        self.logger.info("2. Add mobile attribute with validation")
+    
+    def _merge_user_profile_config(
+        self,
+        current_config: Dict[str, Any],
+        attributes: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Current config with our attributes appended, leaving both inputs intact."""
+        self.logger.info(
+            f"Profile attribute(s) added: {', '.join(a['name'] for a in attributes)}"
+        )
+        return {
+            **current_config,
+            'attributes': [*current_config.get('attributes', []), *attributes]
+        }
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+JSON Codec Micro-benchmark
+Compares the available codecs and the streaming array parser on recorded
+Admin API payloads
+
+Record payloads from a running Keycloak (uses the usual KEYCLOAK_* env):
+    python benchmarks/json_codec_benchmark.py --record payloads/
+
+Benchmark recorded payloads:
+    python benchmarks/json_codec_benchmark.py payloads/*.json
+
+Benchmark generated payloads (one large element, many small ones):
+    python benchmarks/json_codec_benchmark.py --synthetic
+
+Check the streaming parser against json.loads across chunk boundaries:
+    python benchmarks/json_codec_benchmark.py --check
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.json_codec import CODECS, iter_json_array  # noqa: E402
+
+CHUNK_SIZE = 64 * 1024
+
+# Endpoints recorded by --record (relative to /admin/realms/{realm})
+RECORDED_ENDPOINTS = {
+    'clients': '/clients',
+    'client-scopes': '/client-scopes',
+    'groups': '/groups?briefRepresentation=false',
+    'roles': '/roles',
+    'users': '/users?max=5000',
+    'events': '/events?max=5000'
+}
+
+
+def record(directory: str, realm: str):
+    """Save raw response bodies from the configured Keycloak."""
+    from config.environment import Environment
+    from utils.keycloak_client import KeycloakClient
+    
+    env = Environment()
+    client = KeycloakClient(
+        env.KEYCLOAK_URL, env.KEYCLOAK_ADMIN_USERNAME, env.KEYCLOAK_ADMIN_PASSWORD
+    )
+    if not client.connect():
+        sys.exit(1)
+    
+    os.makedirs(directory, exist_ok=True)
+    requests_to_record = [
+        (f'{name}.json', 'GET', f'/realms/{realm}{endpoint}')
+        for name, endpoint in RECORDED_ENDPOINTS.items()
+    ]
+    requests_to_record.append(
+        ('partial-export.json', 'POST', f'/realms/{realm}/partial-export'
+         '?exportClients=true&exportGroupsAndRoles=true')
+    )
+    
+    for filename, method, endpoint in requests_to_record:
+        response = client._request(method, endpoint, data=b'{}' if method == 'POST' else None)
+        if response.status_code != 200:
+            print(f"skip {filename}: HTTP {response.status_code}")
+            continue
+        with open(os.path.join(directory, filename), 'wb') as f:
+            f.write(response.content)
+        print(f"recorded {filename} ({len(response.content) / 1024:.0f} KiB)")
+    client.close()
+
+
+def measure(func: Callable[[], object], repeat: int) -> Tuple[float, float]:
+    """Median wall time (ms) and peak traced memory (KiB) of func."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024
+
+
+def chunks(data: bytes) -> List[bytes]:
+    return [data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE)]
+
+
+def synthetic_payloads() -> List[Tuple[str, bytes]]:
+    """Arrays shaped like the worst cases for the streaming parser."""
+    # A single element spanning hundreds of chunks: it must not be
+    # re-decoded on every chunk
+    large = [{'id': 'export', 'attributes': {'value': ['x' * 50] * 300000}}]
+    small = [
+        {'id': str(i), 'username': f'user{i}', 'enabled': True, 'createdTimestamp': i}
+        for i in range(100000)
+    ]
+    return [
+        ('one-large-element', json.dumps(large).encode('utf-8')),
+        ('many-small-elements', json.dumps(small).encode('utf-8'))
+    ]
+
+
+def check_chunking(rounds: int = 3000, seed: int = 0) -> int:
+    """
+    Stream arrays split at random offsets and compare with json.loads.
+    
+    Numbers split after their sign, '.' or exponent are the interesting
+    cases: the head alone decodes as a shorter number.
+    """
+    rng = random.Random(seed)
+    documents: List[Any] = [
+        [0.1, -25000000000.0, 12345678901234567890, 1.25e-7, -0.0, 3],
+        [{'a': 'x]}', 'b': [1, {'c': '\\"'}]}, True, None, False, 'é😀'],
+        [[], [[]], {}],
+        [7]
+    ]
+    failures = 0
+    for _ in range(rounds):
+        data = json.dumps(rng.choice(documents), ensure_ascii=False).encode('utf-8')
+        cuts = sorted(rng.sample(range(1, len(data)), rng.randint(0, min(10, len(data) - 1))))
+        pieces = [data[i:j] for i, j in zip([0] + cuts, cuts + [len(data)])]
+        try:
+            streamed = list(iter_json_array(pieces))
+        except ValueError as e:
+            streamed = e
+        if streamed != json.loads(data):
+            failures += 1
+            print(f"mismatch for chunks {pieces!r}: {streamed!r}")
+    print(f"{rounds} chunkings checked, {failures} failed")
+    return failures
+
+
+def benchmark(payloads: List[Tuple[str, bytes]], repeat: int):
+    print(f"{'payload':<24} {'size':>9}  {'method':<18} {'median':>10} {'peak mem':>10}")
+    for name, data in payloads:
+        size = f"{len(data) / 1024:.0f} KiB"
+        is_array = data.lstrip()[:1] == b'['
+        pieces = chunks(data)
+        
+        rows = []
+        for codec_name, codec_class in sorted(CODECS.items()):
+            codec = codec_class()
+            decoded = codec.loads(data)
+            rows += [
+                (f'{codec_name} loads', lambda codec=codec: codec.loads(data)),
+                (f'{codec_name} dumps', lambda codec=codec, obj=decoded: codec.dumps(obj))
+            ]
+        if is_array:
+            # Consume and drop items, as a streaming caller would
+            rows.append(
+                ('stream', lambda: sum(1 for _ in iter_json_array(pieces)))
+            )
+        
+        for label, func in rows:
+            median_ms, peak_kib = measure(func, repeat)
+            print(
+                f"{name:<24} {size:>9}  {label:<18} "
+                f"{median_ms:>8.2f}ms {peak_kib:>7.0f}KiB"
+            )
+            name, size = '', ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('payloads', nargs='*', help='recorded JSON payload files')
+    parser.add_argument('--record', metavar='DIR', help='record payloads into DIR')
+    parser.add_argument('--synthetic', action='store_true', help='benchmark generated payloads')
+    parser.add_argument('--check', action='store_true', help='check chunk boundary handling')
+    parser.add_argument('--realm', default='padmini-systems')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    if args.record:
+        record(args.record, args.realm)
+    elif args.check:
+        sys.exit(1 if check_chunking() else 0)
+    elif args.payloads or args.synthetic:
+        payloads = synthetic_payloads() if args.synthetic else []
+        for path in args.payloads:
+            with open(path, 'rb') as f:
+                payloads.append((os.path.basename(path), f.read()))
+        benchmark(payloads, args.repeat)
+    else:
+        parser.error('give payload files, --synthetic, --check or --record DIR')
+
+
+if __name__ == '__main__':
+    main()
@@ -83,6 +83,10 @@ class Constants:
         ]
     }
     
+    # Clients reconciled by ClientManager, one definition per client
+    # (per-tenant clients are appended here)
+    CLIENTS = [PPCS_CLIENT_CONFIG, ASM_CLIENT_CONFIG]
+    
     # Client Scopes Configuration
     CLIENT_SCOPES = {
         "openid": {
@@ -0,0 +1,386 @@
+"""
+Desired State
+Immutable, schema-validated model compiled from constants or YAML/JSON files
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+from jsonschema import Draft202012Validator
+from utils.fingerprint import fingerprint
+
+try:
+    import yaml
+except ImportError:  # JSON desired-state files work without PyYAML
+    yaml = None
+
+
+# Client scopes every Keycloak realm has; clients may reference them
+# without declaring them in clientScopes
+BUILTIN_CLIENT_SCOPES = frozenset({
+    'acr', 'address', 'basic', 'email', 'microprofile-jwt', 'offline_access',
+    'organization', 'phone', 'profile', 'role_list', 'roles',
+    'saml_organization', 'service_account', 'web-origins'
+})
+
+# Realm names (also the tenant realms of a fan-out)
+REALM_NAME_PATTERN = "^[A-Za-z0-9._-]+$"
+
+# Schema of a desired-state document; Keycloak representations are
+# passed through, so only the keys this executor relies on are checked
+_NAME = {"type": "string", "minLength": 1}
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+_STRING_MAP = {"type": "object", "additionalProperties": {"type": "string"}}
+
+_NAMED = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {"name": _NAME}
+}
+
+_PROTOCOL_MAPPER = {
+    "type": "object",
+    "required": ["name", "protocol", "protocolMapper"],
+    "properties": {
+        "name": _NAME,
+        "protocol": {"enum": ["openid-connect", "saml"]},
+        "protocolMapper": _NAME,
+        "consentRequired": {"type": "boolean"},
+        # Keycloak stores mapper settings as strings ("true", not true)
+        "config": _STRING_MAP
+    }
+}
+
+DESIRED_STATE_SCHEMA = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "type": "object",
+    "required": ["realm"],
+    "additionalProperties": False,
+    "properties": {
+        "realm": {
+            "type": "object",
+            "required": ["realm"],
+            "properties": {
+                "realm": {"type": "string", "pattern": REALM_NAME_PATTERN},
+                "displayName": {"type": "string"},
+                "enabled": {"type": "boolean"},
+                "sslRequired": {"enum": ["all", "external", "none"]}
+            }
+        },
+        "clients": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["clientId"],
+                "properties": {
+                    "clientId": _NAME,
+                    "enabled": {"type": "boolean"},
+                    "publicClient": {"type": "boolean"},
+                    "redirectUris": _STRINGS,
+                    "webOrigins": _STRINGS,
+                    "attributes": _STRING_MAP,
+                    "defaultClientScopes": _STRINGS,
+                    "optionalClientScopes": _STRINGS
+                }
+            }
+        },
+        "clientScopes": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["name", "protocol"],
+                "properties": {
+                    "name": _NAME,
+                    "protocol": {"enum": ["openid-connect", "saml"]},
+                    "attributes": _STRING_MAP,
+                    "protocolMappers": {"type": "array", "items": _PROTOCOL_MAPPER}
+                }
+            }
+        },
+        "userProfile": {
+            "type": "object",
+            "properties": {"attributes": {"type": "array", "items": _NAMED}}
+        },
+        "roles": {
+            "type": "array",
+            "items": {
+                **_NAMED,
+                "properties": {"name": _NAME, "description": {"type": "string"}}
+            }
+        },
+        "groups": {
+            "type": "array",
+            "items": {
+                **_NAMED,
+                "properties": {"name": _NAME, "path": {"type": "string", "pattern": "^/"}}
+            }
+        }
+    }
+}
+
+
+class DesiredStateError(ValueError):
+    """A desired-state document failed preflight; carries every error found."""
+    
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__(
+            f"❌ Invalid desired state ({len(errors)} error(s)):\n   "
+            + "\n   ".join(errors)
+        )
+
+
+class FrozenDict(dict):
+    """
+    Read-only dict.
+    
+    A dict subclass rather than a mapping proxy: it serializes as JSON and
+    compares equal to the plain dicts Keycloak returns.
+    """
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Desired state is read-only")
+    
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list; see FrozenDict."""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Desired state is read-only")
+    
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    
+    def __copy__(self):
+        return self
+    
+    def __deepcopy__(self, memo):
+        return self
+    
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts and lists into their read-only counterparts."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def _items(document: Any, section: str, kind: type) -> Any:
+    """A section when it has the expected shape (schema errors cover the rest)."""
+    value = document.get(section) if isinstance(document, dict) else None
+    return value if isinstance(value, kind) else kind()
+
+
+def _named(items: Iterable[Any], key: str = 'name') -> List[Dict[str, Any]]:
+    return [
+        item for item in items
+        if isinstance(item, dict) and isinstance(item.get(key), str)
+    ]
+
+
+def validation_errors(document: Any) -> List[str]:
+    """
+    Every error in a desired-state document, without any I/O.
+    
+    Schema errors first, then what a schema cannot express: duplicate
+    names, client scope references and user-profile regex patterns.
+    Checks run on whatever parts are well-formed, so one pass reports
+    everything.
+    """
+    validator = Draft202012Validator(DESIRED_STATE_SCHEMA)
+    errors = [
+        f"{'/'.join(str(part) for part in error.absolute_path) or '(root)'}: "
+        f"{error.message}"
+        for error in sorted(
+            validator.iter_errors(document),
+            key=lambda e: [str(part) for part in e.absolute_path]
+        )
+    ]
+    
+    clients = _named(_items(document, 'clients', list), 'clientId')
+    for section, items, key in (
+        ('clients', clients, 'clientId'),
+        ('roles', _named(_items(document, 'roles', list)), 'name'),
+        ('groups', _named(_items(document, 'groups', list)), 'name')
+    ):
+        seen = set()
+        for item in items:
+            if item[key] in seen:
+                errors.append(f"{section}: duplicate {key} '{item[key]}'")
+            seen.add(item[key])
+    
+    scopes = _items(document, 'clientScopes', dict)
+    for scope_name, scope in scopes.items():
+        if not isinstance(scope, dict):
+            continue
+        if scope.get('name') != scope_name:
+            errors.append(
+                f"clientScopes/{scope_name}: name '{scope.get('name')}' does not match its key"
+            )
+        mappers = _named(scope.get('protocolMappers') or [])
+        names = [mapper['name'] for mapper in mappers]
+        for name in sorted({name for name in names if names.count(name) > 1}):
+            errors.append(f"clientScopes/{scope_name}: duplicate protocol mapper '{name}'")
+    
+    known_scopes = BUILTIN_CLIENT_SCOPES | set(scopes)
+    for client in clients:
+        client_id = client['clientId']
+        assigned = {}
+        for kind in ('default', 'optional'):
+            names = client.get(f'{kind}ClientScopes')
+            assigned[kind] = set(names) if isinstance(names, list) else set()
+            for name in sorted(n for n in assigned[kind] if isinstance(n, str)):
+                if name not in known_scopes:
+                    errors.append(
+                        f"clients/{client_id}: {kind} client scope '{name}' "
+                        f"is neither declared in clientScopes nor built in"
+                    )
+        for name in sorted(n for n in assigned['default'] & assigned['optional'] if isinstance(n, str)):
+            errors.append(
+                f"clients/{client_id}: client scope '{name}' is both default and optional"
+            )
+    
+    for group in _named(_items(document, 'groups', list)):
+        # Only top-level groups are managed
+        if 'path' in group and group['path'] != f"/{group['name']}":
+            errors.append(
+                f"groups/{group['name']}: path '{group['path']}' should be '/{group['name']}'"
+            )
+    
+    profile = _items(document, 'userProfile', dict)
+    for attribute in _named(profile.get('attributes') or []):
+        validations = attribute.get('validations')
+        pattern = validations.get('pattern') if isinstance(validations, dict) else None
+        if not isinstance(pattern, dict) or 'pattern' not in pattern:
+            continue
+        # Keycloak compiles these as Java regexes; the common subset is
+        # shared with Python's re, so a failure here fails there too
+        try:
+            re.compile(pattern['pattern'])
+        except (re.error, TypeError) as e:
+            errors.append(
+                f"userProfile/{attribute['name']}: invalid pattern "
+                f"{pattern['pattern']!r}: {e}"
+            )
+    return errors
+
+
+class DesiredState:
+    """
+    Compiled desired state of one realm.
+    
+    Exposes the same names as Constants, so managers read it the same way,
+    but every section is frozen: managers share it across threads, realms
+    and reconcile cycles without copying. Clients are pre-indexed by
+    clientId.
+    """
+    
+    def __init__(self, document: Dict[str, Any]):
+        errors = validation_errors(document)
+        if errors:
+            raise DesiredStateError(errors)
+        
+        state = freeze(document)
+        realm_config = state['realm']
+        self.REALM_NAME = realm_config['realm']
+        self.REALM_DISPLAY_NAME = realm_config.get('displayName', self.REALM_NAME)
+        self.REALM_CONFIG = FrozenDict({**realm_config, 'id': self.REALM_NAME})
+        self.CLIENTS = state.get('clients', FrozenList())
+        self.CLIENTS_BY_ID = FrozenDict(
+            (client['clientId'], client) for client in self.CLIENTS
+        )
+        self.CLIENT_SCOPES = state.get('clientScopes', FrozenDict())
+        self.USER_PROFILE_CONFIG = state.get('userProfile', FrozenDict())
+        self.DEFAULT_ROLES = state.get('roles', FrozenList())
+        self.DEFAULT_GROUPS = state.get('groups', FrozenList())
+        self._document = state
+        self._digest: Optional[str] = None
+    
+    @classmethod
+    def from_constants(cls, constants) -> 'DesiredState':
+        """Compile the desired state declared in Constants."""
+        return cls({
+            'realm': constants.REALM_CONFIG,
+            'clients': constants.CLIENTS,
+            'clientScopes': constants.CLIENT_SCOPES,
+            'userProfile': constants.USER_PROFILE_CONFIG,
+            'roles': constants.DEFAULT_ROLES,
+            'groups': constants.DEFAULT_GROUPS
+        })
+    
+    @property
+    def digest(self) -> str:
+        """Fingerprint of the whole document."""
+        if self._digest is None:
+            self._digest = fingerprint(self._document)
+        return self._digest
+    
+    def for_realm(self, realm_name: str, display_name: Optional[str] = None) -> 'DesiredState':
+        """
+        The same desired state for another tenant realm.
+        
+        Only the realm section is rebuilt; everything else is shared.
+        """
+        tenant = object.__new__(DesiredState)
+        tenant.__dict__.update(self.__dict__)
+        display_name = display_name or realm_name
+        tenant.REALM_NAME = realm_name
+        tenant.REALM_DISPLAY_NAME = display_name
+        tenant.REALM_CONFIG = FrozenDict({
+            **self.REALM_CONFIG,
+            'id': realm_name,
+            'realm': realm_name,
+            'displayName': display_name
+        })
+        tenant._document = FrozenDict({**self._document, 'realm': tenant.REALM_CONFIG})
+        tenant._digest = None
+        return tenant
+
+
+# Compiled states by file digest: an unchanged file is parsed and validated
+# once per process, however many realms or reconcile cycles read it
+_compiled: Dict[str, DesiredState] = {}
+_compiled_lock = threading.Lock()
+
+
+def parse_desired_state(path: str, content: bytes) -> Any:
+    """Parse a YAML or JSON desired-state file (by extension)."""
+    if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+        if yaml is None:
+            raise ValueError(f"❌ PyYAML is required to read {path}")
+        return yaml.safe_load(content)
+    return json.loads(content)
+
+
+def load_desired_state(path: str) -> DesiredState:
+    """Load, validate and compile a desired-state file, cached by digest."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    
+    digest = hashlib.sha256(content).hexdigest()
+    with _compiled_lock:
+        state = _compiled.get(digest)
+        if state is None:
+            state = DesiredState(parse_desired_state(path, content))
+            _compiled[digest] = state
+    return state
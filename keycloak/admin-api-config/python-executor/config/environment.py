@@ -3,8 +3,9 @@ Environment Configuration
 Handles all environment variables from Kubernetes secrets
 """
 import os
+import json
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 
 class Environment:
     """Environment variables configuration from Kubernetes secrets."""
@@ -23,13 +24,119 @@ class Environment:
         self.SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
         self.SMTP_FROM = os.getenv('SMTP_FROM')
         self.SMTP_FROM_DISPLAY_NAME = os.getenv('SMTP_FROM_DISPLAY_NAME')
+        # Bumped when SMTP_PASSWORD is rotated; hashes never see the password
+        self.SMTP_SECRET_VERSION = os.getenv('SMTP_SECRET_VERSION', '0')
         
         # Keycloak Server Configuration
         self.KEYCLOAK_URL = os.getenv('KEYCLOAK_URL', 'http://localhost:8080')
         
+        # Several Keycloak instances kept in sync by one run (e.g.
+        # "staging,prod,dr"); each reads KEYCLOAK_<NAME>_URL and its own
+        # secret's KEYCLOAK_<NAME>_ADMIN_USERNAME / _PASSWORD, and
+        # optionally KEYCLOAK_<NAME>_HEALTH_URL
+        self.KEYCLOAK_INSTANCES = os.getenv('KEYCLOAK_INSTANCES')
+        
+        # Readiness: overall startup deadline and optional health endpoint
+        # (Keycloak 25+ serves /health/ready on the management port 9000)
+        self.KEYCLOAK_READY_TIMEOUT = float(os.getenv('KEYCLOAK_READY_TIMEOUT', '300'))
+        self.KEYCLOAK_HEALTH_URL = os.getenv('KEYCLOAK_HEALTH_URL')
+        
+        # Refresh admin tokens this many seconds before they expire
+        self.KEYCLOAK_TOKEN_REFRESH_MARGIN = float(
+            os.getenv('KEYCLOAK_TOKEN_REFRESH_MARGIN', '30')
+        )
+        
+        # HTTP timeouts (seconds), retries and circuit breaker
+        self.KEYCLOAK_CONNECT_TIMEOUT = float(os.getenv('KEYCLOAK_CONNECT_TIMEOUT', '5'))
+        self.KEYCLOAK_READ_TIMEOUT = float(os.getenv('KEYCLOAK_READ_TIMEOUT', '30'))
+        self.KEYCLOAK_WRITE_TIMEOUT = float(os.getenv('KEYCLOAK_WRITE_TIMEOUT', '60'))
+        self.KEYCLOAK_BULK_TIMEOUT = float(os.getenv('KEYCLOAK_BULK_TIMEOUT', '300'))
+        self.KEYCLOAK_MAX_RETRIES = int(os.getenv('KEYCLOAK_MAX_RETRIES', '4'))
+        self.KEYCLOAK_RETRY_MAX_WAIT = float(os.getenv('KEYCLOAK_RETRY_MAX_WAIT', '15'))
+        self.KEYCLOAK_BREAKER_THRESHOLD = int(os.getenv('KEYCLOAK_BREAKER_THRESHOLD', '5'))
+        self.KEYCLOAK_BREAKER_COOLDOWN = float(os.getenv('KEYCLOAK_BREAKER_COOLDOWN', '30'))
+        
+        # HTTP connection pool: per-host pool size, keep-alive, compression
+        self.KEYCLOAK_POOL_CONNECTIONS = int(os.getenv('KEYCLOAK_POOL_CONNECTIONS', '4'))
+        self.KEYCLOAK_POOL_MAXSIZE = int(os.getenv('KEYCLOAK_POOL_MAXSIZE', '16'))
+        self.KEYCLOAK_POOL_BLOCK = os.getenv('KEYCLOAK_POOL_BLOCK', 'true').lower() == 'true'
+        self.KEYCLOAK_TCP_KEEPALIVE = int(os.getenv('KEYCLOAK_TCP_KEEPALIVE', '60'))
+        self.KEYCLOAK_HTTP_COMPRESSION = (
+            os.getenv('KEYCLOAK_HTTP_COMPRESSION', 'true').lower() == 'true'
+        )
+        
+        # Page size for paged list endpoints (users, groups, clients, events)
+        self.KEYCLOAK_PAGE_SIZE = int(os.getenv('KEYCLOAK_PAGE_SIZE', '100'))
+        
+        # JSON codec: 'auto' (orjson when installed), 'orjson' or 'json'
+        self.KEYCLOAK_JSON_CODEC = os.getenv('KEYCLOAK_JSON_CODEC', 'auto').lower()
+        
+        # Concurrency Configuration
+        self.KEYCLOAK_MAX_IN_FLIGHT = int(os.getenv('KEYCLOAK_MAX_IN_FLIGHT', '8'))
+        self.KEYCLOAK_STEP_WORKERS = int(os.getenv('KEYCLOAK_STEP_WORKERS', '4'))
+        
         # Operation Configuration
         self.ACTION = os.getenv('ACTION', 'create').lower()
         
+        # YAML or JSON desired-state file (e.g. mounted from a ConfigMap);
+        # unset: the desired state declared in config/constants.py
+        self.DESIRED_STATE_FILE = os.getenv('DESIRED_STATE_FILE')
+        
+        # Apply mode: 'incremental' (one call per resource) or 'bulk'
+        # (clients, roles and groups through a single partialImport)
+        self.APPLY_MODE = os.getenv('APPLY_MODE', 'incremental').lower()
+        self.IMPORT_IF_RESOURCE_EXISTS = os.getenv(
+            'IMPORT_IF_RESOURCE_EXISTS', 'SKIP'
+        ).upper()
+        
+        # Optimistic create: POST first and resolve IDs only on 409,
+        # skipping the read before each create on fresh installs
+        self.OPTIMISTIC_CREATE = os.getenv('OPTIMISTIC_CREATE', 'false').lower() == 'true'
+        
+        # Delete protocol mappers on managed client scopes that are not
+        # declared in CLIENT_SCOPES (Keycloak built-ins included)
+        self.PRUNE_UNMANAGED_MAPPERS = (
+            os.getenv('PRUNE_UNMANAGED_MAPPERS', 'false').lower() == 'true'
+        )
+        
+        # Skip realm, clients and scopes whose recorded fingerprint matches
+        # the desired state; false compares full representations every run
+        self.TRUST_FINGERPRINTS = (
+            os.getenv('TRUST_FINGERPRINTS', 'true').lower() == 'true'
+        )
+        
+        # Bumped when a client secret in the desired state is rotated;
+        # fingerprints leave secrets out, so they see this counter instead
+        self.CLIENT_SECRET_VERSION = os.getenv('CLIENT_SECRET_VERSION', '0')
+        
+        # Run every manager even when the desired-state digest recorded on
+        # the realm by the last successful create is unchanged
+        self.FORCE = os.getenv('FORCE', 'false').lower() == 'true'
+        
+        # Checkpoint file on a volume kept across container restarts, so a
+        # retried create resumes at the first incomplete step (unset: off)
+        self.CHECKPOINT_FILE = os.getenv('CHECKPOINT_FILE')
+        
+        # destroy removes the whole realm with one DELETE (Keycloak cascades
+        # it to everything inside); false keeps the realm and deletes only
+        # the managed clients, scopes, roles and groups
+        self.DESTROY_REALM = os.getenv('DESTROY_REALM', 'true').lower() == 'true'
+        
+        # Reconcile daemon: seconds between cycles, ± jitter fraction, and
+        # the port serving /healthz and /metrics
+        self.RECONCILE_INTERVAL = float(os.getenv('RECONCILE_INTERVAL', '300'))
+        self.RECONCILE_JITTER = float(os.getenv('RECONCILE_JITTER', '0.2'))
+        self.METRICS_PORT = int(os.getenv('METRICS_PORT', '9102'))
+        
+        # Tenant realms built from the padmini-systems template: a comma
+        # list in REALMS or a JSON list of {"realm", "displayName"} objects
+        # in REALMS_FILE, run REALM_WORKERS at a time; realms not started
+        # within RUN_TIME_BUDGET seconds are skipped (0: no budget)
+        self.REALMS = os.getenv('REALMS')
+        self.REALMS_FILE = os.getenv('REALMS_FILE')
+        self.REALM_WORKERS = int(os.getenv('REALM_WORKERS', '4'))
+        self.RUN_TIME_BUDGET = float(os.getenv('RUN_TIME_BUDGET', '0'))
+        
         # Validation
         self._validate()
         
@@ -37,15 +144,37 @@ class Environment:
     
     def _validate(self):
         """Validate required environment variables."""
-        required_vars = {
-            'KEYCLOAK_ADMIN_USERNAME': self.KEYCLOAK_ADMIN_USERNAME,
-            'KEYCLOAK_ADMIN_PASSWORD': self.KEYCLOAK_ADMIN_PASSWORD,
-        }
+        if self.KEYCLOAK_INSTANCES:
+            required_vars = {}
+            for name in self._instance_names():
+                prefix = self._instance_prefix(name)
+                for suffix in ('URL', 'ADMIN_USERNAME', 'ADMIN_PASSWORD'):
+                    var = f"{prefix}_{suffix}"
+                    required_vars[var] = os.getenv(var)
+        else:
+            required_vars = {
+                'KEYCLOAK_ADMIN_USERNAME': self.KEYCLOAK_ADMIN_USERNAME,
+                'KEYCLOAK_ADMIN_PASSWORD': self.KEYCLOAK_ADMIN_PASSWORD,
+            }
         
         missing = [var for var, value in required_vars.items() if not value]
         if missing:
             raise ValueError(f"❌ Missing required environment variables: {missing}")
         
+        if self.APPLY_MODE not in ('incremental', 'bulk'):
+            raise ValueError(f"❌ Invalid APPLY_MODE: {self.APPLY_MODE}")
+        
+        if self.IMPORT_IF_RESOURCE_EXISTS not in ('SKIP', 'OVERWRITE', 'FAIL'):
+            raise ValueError(
+                f"❌ Invalid IMPORT_IF_RESOURCE_EXISTS: {self.IMPORT_IF_RESOURCE_EXISTS}"
+            )
+        
+        if self.KEYCLOAK_POOL_MAXSIZE < self.KEYCLOAK_MAX_IN_FLIGHT:
+            self.logger.warning(
+                "⚠️  KEYCLOAK_POOL_MAXSIZE is below KEYCLOAK_MAX_IN_FLIGHT; "
+                "concurrent requests will queue for connections"
+            )
+        
         # Validate SMTP if provided
         smtp_vars = [self.SMTP_HOST, self.SMTP_USER, self.SMTP_PASSWORD]
         if any(smtp_vars) and not all(smtp_vars):
@@ -67,6 +196,55 @@ class Environment:
             }
         return None
     
+    def _instance_names(self) -> List[str]:
+        names = [
+            name.strip() for name in (self.KEYCLOAK_INSTANCES or '').split(',')
+            if name.strip()
+        ]
+        if len(set(names)) != len(names):
+            raise ValueError(f"❌ Duplicate name in KEYCLOAK_INSTANCES: {names}")
+        return names
+    
+    @staticmethod
+    def _instance_prefix(name: str) -> str:
+        return f"KEYCLOAK_{name.upper().replace('-', '_')}"
+    
+    def instance_targets(self) -> List[Dict[str, Optional[str]]]:
+        """Keycloak instances to apply to; empty for the single KEYCLOAK_URL."""
+        targets = []
+        for name in self._instance_names():
+            prefix = self._instance_prefix(name)
+            targets.append({
+                'name': name,
+                'url': os.getenv(f"{prefix}_URL"),
+                'username': os.getenv(f"{prefix}_ADMIN_USERNAME"),
+                'password': os.getenv(f"{prefix}_ADMIN_PASSWORD"),
+                'health_url': os.getenv(f"{prefix}_HEALTH_URL")
+            })
+        return targets
+    
+    def realm_specs(self) -> List[Dict[str, str]]:
+        """Tenant realms to fan out to; empty for the single template realm."""
+        if self.REALMS_FILE:
+            with open(self.REALMS_FILE, 'r', encoding='utf-8') as f:
+                specs = json.load(f)
+        elif self.REALMS:
+            specs = [
+                {'realm': name.strip()}
+                for name in self.REALMS.split(',') if name.strip()
+            ]
+        else:
+            return []
+        
+        seen = set()
+        for spec in specs:
+            if not isinstance(spec, dict) or not spec.get('realm'):
+                raise ValueError(f"❌ Invalid realm spec: {spec}")
+            if spec['realm'] in seen:
+                raise ValueError(f"❌ Duplicate realm: {spec['realm']}")
+            seen.add(spec['realm'])
+        return specs
+    
     def is_create_action(self) -> bool:
         """Check if action is create."""
         return self.ACTION == 'create'
@@ -78,3 +256,15 @@ class Environment:
     def is_validate_action(self) -> bool:
         """Check if action is validate."""
         return self.ACTION == 'validate'
+    
+    def is_reconcile_action(self) -> bool:
+        """Check if action is the reconcile daemon."""
+        return self.ACTION == 'reconcile'
+    
+    def is_bulk_apply(self) -> bool:
+        """Check if resources are applied through partialImport."""
+        return self.APPLY_MODE == 'bulk'
+    
+    def is_plan_action(self) -> bool:
+        """Check if action is plan."""
+        return self.ACTION == 'plan'
@@ -2,16 +2,44 @@
 Main Orchestrator
 Coordinates all Keycloak configuration operations
 """
+import os
+import random
+import re
+import signal
 import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from config.environment import Environment
 from config.constants import Constants
+from config.desired_state import (
+    REALM_NAME_PATTERN,
+    DesiredState,
+    DesiredStateError,
+    load_desired_state
+)
 from utils.logger import PadminiLogger
 from utils.keycloak_client import KeycloakClient
+from utils.transport import TransportPolicy
+from utils.http_session import PoolSettings
+from utils.scheduler import DependencyScheduler
+from utils.realm_snapshot import RealmSnapshot
+from utils.checkpoint import CheckpointStore
+from utils.realm_fanout import RealmFanout
+from utils.instance_fanout import InstanceFanout
+from utils.reconcile_server import ReconcileMetrics, start_reconcile_server
+from utils.fingerprint import (
+    RUN_DIGEST_ATTRIBUTE,
+    fingerprint,
+    fingerprint_update,
+    source_fingerprint,
+    stored_fingerprint
+)
 from actions.realm_manager import RealmManager
 from actions.client_scope_manager import ClientScopeManager
-from actions.ppcs_client.ppcs_client_manager import PPCSClientManager
-from actions.asm_client.asm_client_manager import ASMClientManager
+from actions.client_manager import ClientManager
 from actions.user_profile_manager import UserProfileManager
+from actions.bulk_import_manager import BulkImportManager
 
 
 class KeycloakOrchestrator:
@@ -20,45 +48,73 @@ class KeycloakOrchestrator:
     Handles the complete setup/teardown of Padmini Systems realm.
     """
     
-    def __init__(self):
-        self.env = Environment()
-        self.constants = Constants()
+    # Human-readable step names for failure messages
+    STEP_DESCRIPTIONS = {
+        'realm': 'realm',
+        'client_scopes': 'client scopes',
+        'clients': 'clients',
+        'user_profile': 'user profile',
+        'bulk_import': 'bulk import'
+    }
+    
+    # Orchestrator method run for each action
+    ACTIONS = {
+        'create': 'create_configuration',
+        'destroy': 'destroy_configuration',
+        'validate': 'validate_configuration',
+        'plan': 'plan_configuration',
+        'reconcile': 'reconcile_forever',
+        'preflight': 'preflight'
+    }
+    
+    # Actions that can fan out to several realms or instances
+    FANOUT_ACTIONS = ('create', 'destroy', 'validate', 'plan')
+    
+    def __init__(
+        self,
+        env: Optional[Environment] = None,
+        constants: Optional[DesiredState] = None,
+        keycloak_client: Optional[KeycloakClient] = None,
+        checkpoint_file: Optional[str] = None
+    ):
+        self.env = env or Environment()
+        # Compiled once and shared by every realm and instance orchestrator
+        self.constants = constants
         self.logger = PadminiLogger(__name__)
-        self.keycloak_client = None
+        self.keycloak_client = keycloak_client
         self.managers = {}
+        self.realm_specs: List[Dict[str, str]] = []
+        self.instance_targets: List[Dict[str, Optional[str]]] = []
+        self.checkpoint = CheckpointStore(checkpoint_file or self.env.CHECKPOINT_FILE)
+        # Tenant realms of a fan-out skip the per-realm success summary
+        self.print_summary = True
         
     def initialize(self) -> bool:
         """Initialize Keycloak client and all managers."""
         try:
             self.logger.start_operation("Keycloak orchestrator initialization")
             
+            # Each instance connects from its own worker, concurrently
+            if self.instance_targets:
+                self.logger.success(
+                    f"Keycloak orchestrator initialized for "
+                    f"{len(self.instance_targets)} instance(s)"
+                )
+                return True
+            
             # Initialize Keycloak client
-            self.keycloak_client = KeycloakClient(
-                server_url=self.env.KEYCLOAK_URL,
-                username=self.env.KEYCLOAK_ADMIN_USERNAME,
-                password=self.env.KEYCLOAK_ADMIN_PASSWORD
+            self.keycloak_client = self._create_client(
+                self.env.KEYCLOAK_URL,
+                self.env.KEYCLOAK_ADMIN_USERNAME,
+                self.env.KEYCLOAK_ADMIN_PASSWORD,
+                self.env.KEYCLOAK_HEALTH_URL
             )
             
             if not self.keycloak_client.connect():
                 self.logger.error("Failed to connect to Keycloak")
                 return False
                 
-            # Initialize all managers
-            self.managers = {
-                'realm': RealmManager(self.keycloak_client, self.constants),
-                'client_scopes': ClientScopeManager(
-                    self.keycloak_client, self.constants
-                ),
-                'ppcs_client': PPCSClientManager(
-                    self.keycloak_client, self.constants
-                ),
-                'asm_client': ASMClientManager(
-                    self.keycloak_client, self.constants
-                ),
-                'user_profile': UserProfileManager(
-                    self.keycloak_client, self.constants
-                )
-            }
+            self.managers = self._build_managers()
             
             self.logger.success(
                 "Keycloak orchestrator initialized successfully"
@@ -69,42 +125,374 @@ class KeycloakOrchestrator:
             self.logger.error(f"Failed to initialize orchestrator: {str(e)}")
             return False
     
+    def preflight(self) -> bool:
+        """
+        Check the desired state and fan-out settings without any I/O.
+        
+        Runs before the readiness wait and authentication, so a broken
+        constant fails in milliseconds with every error listed, instead of
+        minutes later on each Job retry.
+        """
+        started = time.perf_counter()
+        errors = []
+        try:
+            try:
+                self.constants = self.constants or self._load_desired_state()
+            except DesiredStateError as e:
+                errors += e.errors
+            
+            self.realm_specs = self.env.realm_specs()
+            self.instance_targets = self.env.instance_targets()
+            errors += [
+                f"REALMS: invalid realm name '{spec['realm']}'"
+                for spec in self.realm_specs
+                if not re.match(REALM_NAME_PATTERN, spec['realm'])
+            ]
+            
+        except (OSError, ValueError) as e:
+            errors.append(str(e))
+        
+        if errors:
+            for error in errors:
+                self.logger.error(f"Preflight: {error}")
+            self.logger.error(f"Preflight failed with {len(errors)} error(s)")
+            return False
+        
+        self.logger.success(
+            f"Preflight passed in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+        return True
+    
+    def _load_desired_state(self) -> DesiredState:
+        """Desired state from DESIRED_STATE_FILE, or the one in Constants."""
+        if self.env.DESIRED_STATE_FILE:
+            return load_desired_state(self.env.DESIRED_STATE_FILE)
+        return DesiredState.from_constants(Constants)
+    
+    def _create_client(
+        self,
+        server_url: str,
+        username: str,
+        password: str,
+        health_url: Optional[str]
+    ) -> KeycloakClient:
+        """Keycloak client with its own connection pool and token."""
+        return KeycloakClient(
+            server_url=server_url,
+            username=username,
+            password=password,
+            max_in_flight=self.env.KEYCLOAK_MAX_IN_FLIGHT,
+            token_refresh_margin=self.env.KEYCLOAK_TOKEN_REFRESH_MARGIN,
+            ready_timeout=self.env.KEYCLOAK_READY_TIMEOUT,
+            health_url=health_url,
+            transport_policy=self._transport_policy(),
+            pool_settings=PoolSettings(
+                pool_connections=self.env.KEYCLOAK_POOL_CONNECTIONS,
+                pool_maxsize=self.env.KEYCLOAK_POOL_MAXSIZE,
+                pool_block=self.env.KEYCLOAK_POOL_BLOCK,
+                keepalive_idle=self.env.KEYCLOAK_TCP_KEEPALIVE,
+                compression=self.env.KEYCLOAK_HTTP_COMPRESSION
+            ),
+            page_size=self.env.KEYCLOAK_PAGE_SIZE,
+            json_codec=self.env.KEYCLOAK_JSON_CODEC
+        )
+    
+    def _build_managers(self) -> Dict[str, Any]:
+        """All managers for this orchestrator's realm."""
+        optimistic = self.env.OPTIMISTIC_CREATE
+        # Console edits leave fingerprints untouched, so the daemon
+        # must compare the real settings to repair them
+        trust = (
+            self.env.TRUST_FINGERPRINTS
+            and not self.env.is_reconcile_action()
+        )
+        managers = {
+            'realm': RealmManager(
+                self.keycloak_client, self.constants,
+                smtp_config=self.env.get_smtp_config(),
+                smtp_secret_version=self.env.SMTP_SECRET_VERSION,
+                optimistic_create=optimistic,
+                trust_fingerprints=trust
+            ),
+            'client_scopes': ClientScopeManager(
+                self.keycloak_client, self.constants,
+                prune_mappers=self.env.PRUNE_UNMANAGED_MAPPERS,
+                optimistic_create=optimistic,
+                trust_fingerprints=trust
+            ),
+            'clients': ClientManager(
+                self.keycloak_client, self.constants,
+                secret_version=self.env.CLIENT_SECRET_VERSION,
+                optimistic_create=optimistic,
+                trust_fingerprints=trust
+            ),
+            'user_profile': UserProfileManager(
+                self.keycloak_client, self.constants
+            )
+        }
+        
+        if self.env.is_bulk_apply():
+            managers['bulk_import'] = BulkImportManager(
+                self.keycloak_client, self.constants,
+                if_resource_exists=self.env.IMPORT_IF_RESOURCE_EXISTS
+            )
+        return managers
+    
+    def for_realm(self, spec: Dict[str, str]) -> 'KeycloakOrchestrator':
+        """
+        Orchestrator for one tenant realm built from this template.
+        
+        Shares the environment and the connected Keycloak client (session,
+        token and in-flight limit); only the managers and the checkpoint
+        file are the tenant's own.
+        """
+        realm = spec['realm']
+        # Suffix this orchestrator's own file, so realms of different
+        # instances never share a checkpoint
+        checkpoint_file = None
+        if self.checkpoint.path:
+            base, ext = os.path.splitext(self.checkpoint.path)
+            checkpoint_file = f"{base}-{realm}{ext}"
+        
+        tenant = KeycloakOrchestrator(
+            env=self.env,
+            constants=self.constants.for_realm(realm, spec.get('displayName')),
+            keycloak_client=self.keycloak_client,
+            checkpoint_file=checkpoint_file
+        )
+        tenant.managers = tenant._build_managers()
+        tenant.print_summary = False
+        return tenant
+    
+    def run_for_realms(self, action: str) -> bool:
+        """Run an action for every tenant realm on a bounded pool."""
+        self.logger.start_operation(
+            f"Action '{action}' for {len(self.realm_specs)} realm(s)"
+        )
+        fanout = RealmFanout(
+            max_workers=self.env.REALM_WORKERS,
+            time_budget=self.env.RUN_TIME_BUDGET
+        )
+        results = fanout.run({
+            spec['realm']: getattr(self.for_realm(spec), self.ACTIONS[action])
+            for spec in self.realm_specs
+        })
+        fanout.log_report(results)
+        return all(result.success for result in results.values())
+    
+    def run_action(self, action: str) -> bool:
+        """Run an action on this orchestrator's instance, per realm if listed."""
+        if self.realm_specs:
+            return self.run_for_realms(action)
+        return getattr(self, self.ACTIONS[action])()
+    
+    def for_instance(self, target: Dict[str, Optional[str]]) -> 'KeycloakOrchestrator':
+        """
+        Orchestrator for one Keycloak instance, not yet connected.
+        
+        Shares the environment, constants and realm list, so the desired
+        state is the same object everywhere; the client is the instance's
+        own. Checkpoint files are suffixed with the instance name.
+        """
+        checkpoint_file = None
+        if self.env.CHECKPOINT_FILE:
+            base, ext = os.path.splitext(self.env.CHECKPOINT_FILE)
+            checkpoint_file = f"{base}-{target['name']}{ext}"
+        
+        instance = KeycloakOrchestrator(
+            env=self.env,
+            constants=self.constants,
+            keycloak_client=self._create_client(
+                target['url'], target['username'],
+                target['password'], target['health_url']
+            ),
+            checkpoint_file=checkpoint_file
+        )
+        instance.realm_specs = self.realm_specs
+        return instance
+    
+    def run_for_instances(self, action: str) -> bool:
+        """Run an action on every Keycloak instance concurrently."""
+        self.logger.start_operation(
+            f"Action '{action}' on {len(self.instance_targets)} instance(s)"
+        )
+        instances = {
+            target['name']: self.for_instance(target)
+            for target in self.instance_targets
+        }
+        
+        def apply(name: str) -> Callable[[], bool]:
+            instance = instances[name]
+            
+            def run() -> bool:
+                if not instance.keycloak_client.connect():
+                    self.logger.error(f"Failed to connect to instance '{name}'")
+                    return False
+                instance.managers = instance._build_managers()
+                return instance.run_action(action)
+            return run
+        
+        fanout = InstanceFanout()
+        try:
+            results = fanout.run(
+                {name: apply(name) for name in instances},
+                lambda name: {
+                    **instances[name].keycloak_client.transport.stats,
+                    'changes': instances[name].keycloak_client.applied_changes
+                }
+            )
+        finally:
+            for instance in instances.values():
+                instance.keycloak_client.close()
+        fanout.log_report(results)
+        return all(result.success for result in results.values())
+    
+    def _transport_policy(self) -> TransportPolicy:
+        """HTTP timeouts, retry and circuit breaker settings from environment."""
+        connect = self.env.KEYCLOAK_CONNECT_TIMEOUT
+        return TransportPolicy(
+            timeouts={
+                'read': (connect, self.env.KEYCLOAK_READ_TIMEOUT),
+                'write': (connect, self.env.KEYCLOAK_WRITE_TIMEOUT),
+                'bulk': (connect, self.env.KEYCLOAK_BULK_TIMEOUT),
+                'token': (connect, self.env.KEYCLOAK_READ_TIMEOUT)
+            },
+            max_retries=self.env.KEYCLOAK_MAX_RETRIES,
+            backoff_max=self.env.KEYCLOAK_RETRY_MAX_WAIT,
+            breaker_threshold=self.env.KEYCLOAK_BREAKER_THRESHOLD,
+            breaker_cooldown=self.env.KEYCLOAK_BREAKER_COOLDOWN
+        )
+    
+    def _checkpointed(self, name: str, create: Callable[[], bool]) -> Callable[[], bool]:
+        """Skip a step completed earlier; record the step once it succeeds."""
+        if name in self.checkpoint.completed:
+            def skip() -> bool:
+                self.logger.skip_operation(
+                    f"Step '{name}'", "Completed by a previous attempt"
+                )
+                return True
+            return skip
+        
+        def run() -> bool:
+            success = create()
+            if success:
+                self.checkpoint.complete(
+                    name,
+                    self.keycloak_client.created_realms,
+                    self.keycloak_client.index.export()
+                )
+            return success
+        return run
+    
+    def _desired_state_digest(self) -> str:
+        """Digest of everything a create run converges to, and of this code."""
+        smtp = self.env.get_smtp_config() or {}
+        return fingerprint({
+            'desired_state': self.constants.digest,
+            # The digest is stored on the realm: the password is represented
+            # by its rotation counter, never hashed itself
+            'smtp': {key: value for key, value in smtp.items() if key != 'password'},
+            'smtp_secret_version': self.env.SMTP_SECRET_VERSION,
+            'client_secret_version': self.env.CLIENT_SECRET_VERSION,
+            'settings': {
+                'apply_mode': self.env.APPLY_MODE,
+                'if_resource_exists': self.env.IMPORT_IF_RESOURCE_EXISTS,
+                'prune_mappers': self.env.PRUNE_UNMANAGED_MAPPERS
+            },
+            'executor': source_fingerprint(os.path.dirname(os.path.abspath(__file__)))
+        })
+    
+    def _stored_digest(self) -> Optional[str]:
+        """Run digest recorded on the realm, if it exists and has one."""
+        realm = self.keycloak_client.get_realm(self.constants.REALM_NAME)
+        return stored_fingerprint(realm, RUN_DIGEST_ATTRIBUTE) if realm else None
+    
+    def _is_up_to_date(self, digest: str, stored: Optional[str]) -> bool:
+        """Whether the realm records this digest and nothing forces a run."""
+        if self.env.FORCE or not self.env.TRUST_FINGERPRINTS:
+            return False
+        return stored == digest
+    
+    def _record_digest(self, digest: str):
+        """Store the run digest on the realm; failing only costs a full run."""
+        if not self.keycloak_client.update_realm(
+            self.constants.REALM_NAME,
+            fingerprint_update(digest, RUN_DIGEST_ATTRIBUTE)
+        ):
+            self.logger.warning("Failed to record the desired-state digest")
+    
+    def _build_scheduler(self, exclude: Tuple[str, ...] = ()) -> DependencyScheduler:
+        """Build the step graph from each manager's declared dependencies."""
+        dependencies = {
+            name: tuple(dep for dep in manager.dependencies if dep not in exclude)
+            for name, manager in self.managers.items()
+            if name not in exclude
+        }
+        
+        # In bulk mode the per-resource managers only reconcile what the
+        # partial import left over, so they run after it
+        if 'bulk_import' in dependencies:
+            for name in BulkImportManager.IMPORTS_FOR:
+                dependencies[name] += ('bulk_import',)
+        
+        return DependencyScheduler(
+            dependencies, max_workers=self.env.KEYCLOAK_STEP_WORKERS
+        )
+    
     def create_configuration(self) -> bool:
         """Create complete Keycloak configuration."""
         try:
             self.logger.start_operation("Keycloak configuration creation")
             
-            # Step 1: Create/Update Realm
-            self.logger.info("Step 1: Creating realm...")
-            if not self.managers['realm'].create():
-                self.logger.error("Failed to create realm")
-                return False
-                
-            # Step 2: Create Client Scopes (openid, profile, email, mobile)
-            self.logger.info("Step 2: Creating client scopes...")
-            if not self.managers['client_scopes'].create():
-                self.logger.error("Failed to create client scopes")
-                return False
-                
-            # Step 3: Create PPCS Web App Client
-            self.logger.info("Step 3: Creating PPCS web client...")
-            if not self.managers['ppcs_client'].create():
-                self.logger.error("Failed to create PPCS client")
-                return False
-                
-            # Step 4: Create ASM Microservices Client
-            self.logger.info("Step 4: Creating ASM microservices client...")
-            if not self.managers['asm_client'].create():
-                self.logger.error("Failed to create ASM client")
-                return False
-                
-            # Step 5: Configure User Profile with Roles and Groups
-            self.logger.info("Step 5: Configuring user profile...")
-            if not self.managers['user_profile'].create():
-                self.logger.error("Failed to configure user profile")
+            digest = self._desired_state_digest()
+            stored = self._stored_digest()
+            if self._is_up_to_date(digest, stored):
+                self.logger.skip_operation(
+                    "Keycloak configuration creation",
+                    "Desired state unchanged since the last successful run"
+                )
+                return True
+            
+            if self.checkpoint.load(digest):
+                self.logger.info(
+                    f"Resuming after steps completed by a previous attempt: "
+                    f"{', '.join(sorted(self.checkpoint.completed))}"
+                )
+                self.keycloak_client.index.restore(self.checkpoint.ids)
+                self.keycloak_client.created_realms.update(
+                    self.checkpoint.created_realms
+                )
+            
+            # Realm → client scopes → clients; user profile only needs the
+            # realm, so independent managers run in parallel
+            scheduler = self._build_scheduler()
+            results = scheduler.run({
+                name: self._checkpointed(name, manager.create)
+                for name, manager in self.managers.items()
+            })
+            scheduler.log_timing_report(results)
+            
+            success = True
+            for name, result in results.items():
+                description = self.STEP_DESCRIPTIONS.get(name, name)
+                if result.skipped:
+                    self.logger.error(
+                        f"Skipped {description}: a dependency failed"
+                    )
+                    success = False
+                elif not result.success:
+                    self.logger.error(f"Failed to create {description}")
+                    success = False
+            
+            if not success:
                 return False
             
-            self._print_success_summary()
+            # A forced run on a converged realm must not write to it
+            if stored != digest:
+                self._record_digest(digest)
+            self.checkpoint.clear()
+            if self.print_summary:
+                self._print_success_summary()
             return True
             
         except Exception as e:
@@ -116,33 +504,48 @@ class KeycloakOrchestrator:
         try:
             self.logger.start_operation("Keycloak configuration destruction")
             
-            # Destroy in reverse order
-            success = True
+            if self.env.DESTROY_REALM:
+                # Deleting the realm cascades to everything in it, so child
+                # deletes would only add requests: one DELETE in total
+                children = [name for name in self.managers if name != 'realm']
+                self.logger.info(
+                    f"🗑️  Destroy plan: delete realm '{self.constants.REALM_NAME}' "
+                    f"(cascades to {', '.join(children)})"
+                )
+                success = self.managers['realm'].destroy()
+                if success:
+                    self.logger.success("Configuration destroyed successfully!")
+                return success
             
-            self.logger.info("Step 1: Destroying user profile...")
-            if not self.managers['user_profile'].destroy():
-                self.logger.warning("Failed to destroy user profile")
-                success = False
-                
-            self.logger.info("Step 2: Destroying ASM client...")
-            if not self.managers['asm_client'].destroy():
-                self.logger.warning("Failed to destroy ASM client")
-                success = False
-                
-            self.logger.info("Step 3: Destroying PPCS client...")
-            if not self.managers['ppcs_client'].destroy():
-                self.logger.warning("Failed to destroy PPCS client")
-                success = False
-                
-            self.logger.info("Step 4: Destroying client scopes...")
-            if not self.managers['client_scopes'].destroy():
-                self.logger.warning("Failed to destroy client scopes")
-                success = False
-                
-            self.logger.info("Step 5: Destroying realm...")
-            if not self.managers['realm'].destroy():
-                self.logger.warning("Failed to destroy realm")
-                success = False
+            # A partly destroyed realm must not look up to date to create
+            if self.keycloak_client.get_realm(self.constants.REALM_NAME):
+                self._record_digest('')
+            
+            # Keep the realm; walk the rest of the graph in reverse: a
+            # component is destroyed only after everything depending on it,
+            # independent ones concurrently; keep going past failures
+            scheduler = self._build_scheduler(exclude=('realm',))
+            self.logger.info(
+                f"🗑️  Destroy plan: keep realm '{self.constants.REALM_NAME}', "
+                f"delete {', '.join(reversed(scheduler.order))}"
+            )
+            results = scheduler.run(
+                {
+                    name: manager.destroy
+                    for name, manager in self.managers.items()
+                    if name != 'realm'
+                },
+                reverse=True,
+                stop_on_failure=False
+            )
+            scheduler.log_timing_report(results, reverse=True)
+            
+            success = True
+            for name, result in results.items():
+                if not result.success:
+                    description = self.STEP_DESCRIPTIONS.get(name, name)
+                    self.logger.warning(f"Failed to destroy {description}")
+                    success = False
                 
             if success:
                 self.logger.success("Configuration destroyed successfully!")
@@ -155,18 +558,45 @@ class KeycloakOrchestrator:
             self.logger.error(f"Configuration destruction failed: {str(e)}")
             return False
     
+    def plan_configuration(self) -> bool:
+        """Print the changes a create run would make, without writing."""
+        try:
+            self.logger.start_operation("Keycloak configuration plan")
+            
+            # Later steps are planned against current state, so on a fresh
+            # realm they report everything as missing
+            pending = 0
+            for name in self._build_scheduler().order:
+                plan = self.managers[name].plan()
+                plan.log(self.logger)
+                pending += len(plan.changes)
+            
+            self.logger.info(f"Plan complete: {pending} change(s) pending")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Configuration planning failed: {str(e)}")
+            return False
+    
     def validate_configuration(self) -> bool:
         """Validate that configuration is working correctly."""
         try:
             self.logger.start_operation("Keycloak configuration validation")
             
+            # Read the realm once; every manager validates the same snapshot
+            snapshot = RealmSnapshot.fetch(
+                self.keycloak_client, self.constants.REALM_NAME
+            )
+            if not snapshot:
+                self.logger.error(
+                    f"Realm '{self.constants.REALM_NAME}' not found"
+                )
+                return False
+            
             # Validate each component
             validations = [
-                self.managers['realm'].validate(),
-                self.managers['client_scopes'].validate(),
-                self.managers['ppcs_client'].validate(),
-                self.managers['asm_client'].validate(),
-                self.managers['user_profile'].validate()
+                self.managers[name].validate(snapshot)
+                for name in self._build_scheduler().order
             ]
             
             if all(validations):
@@ -180,6 +610,106 @@ class KeycloakOrchestrator:
             self.logger.error(f"Configuration validation failed: {str(e)}")
             return False
     
+    def reconcile_forever(self) -> bool:
+        """Repair drift on a jittered interval until SIGTERM or SIGINT."""
+        self.logger.start_operation("Keycloak reconcile loop")
+        interval = self.env.RECONCILE_INTERVAL
+        jitter = min(max(self.env.RECONCILE_JITTER, 0.0), 1.0)
+        
+        metrics = ReconcileMetrics(stale_after=3 * interval + 60)
+        server = start_reconcile_server(
+            metrics,
+            lambda: dict(self.keycloak_client.transport.stats),
+            self.env.METRICS_PORT
+        )
+        
+        stop = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stop.set())
+        
+        while not stop.is_set():
+            started = time.monotonic()
+            drifted, failed = self._reconcile_once()
+            metrics.record_cycle(
+                time.monotonic() - started, drifted, failed, success=not failed
+            )
+            # Jitter keeps several daemons from polling Keycloak in lockstep
+            stop.wait(interval * random.uniform(1 - jitter, 1 + jitter))
+        
+        server.shutdown()
+        self.logger.info("Reconcile loop stopped")
+        return True
+    
+    def _reconcile_once(self) -> Tuple[List[str], List[str]]:
+        """
+        One cycle: detect drifted components, repair only those.
+        
+        Every manager plans against a single realm snapshot, so mapper,
+        realm-setting and profile drift is found by the same field diff a
+        create run uses; non-empty plans are applied in dependency order.
+        Returns the drifted and the failed component names.
+        """
+        try:
+            # A ConfigMap update rewrites the file; an unchanged file is
+            # served from the compiled-state cache
+            if self.env.DESIRED_STATE_FILE:
+                desired = self._load_desired_state()
+                if desired is not self.constants:
+                    self.logger.info("Desired state file changed, rebuilding managers")
+                    self.constants = desired
+                    self.managers = self._build_managers()
+            
+            # Resources may have been deleted or recreated since last cycle
+            self.keycloak_client.index.invalidate(self.constants.REALM_NAME)
+            
+            # A partial import always plans one request; the per-resource
+            # managers repair whatever it would have
+            order = self._build_scheduler(exclude=('bulk_import',)).order
+            snapshot = RealmSnapshot.fetch(
+                self.keycloak_client, self.constants.REALM_NAME
+            )
+            plans = {}
+            if snapshot is None:
+                drifted = list(order)
+            else:
+                plans = {
+                    name: self.managers[name].plan(snapshot=snapshot)
+                    for name in order
+                }
+                # Fingerprint stamps alone are not drift
+                drifted = [name for name in order if not plans[name].is_empty]
+            
+            if not drifted:
+                self.logger.info("No drift detected")
+                return [], []
+            
+            self.logger.warning(f"Drift detected in: {', '.join(drifted)}")
+            failed = []
+            for name in drifted:
+                manager = self.managers[name]
+                if any(dep in failed for dep in manager.dependencies):
+                    failed.append(name)
+                    continue
+                # A repaired dependency invalidates the snapshot: plan again
+                if name in plans and not any(
+                    dep in drifted for dep in manager.dependencies
+                ):
+                    repaired = manager.apply(plans[name])
+                else:
+                    repaired = manager.create()
+                if not repaired:
+                    failed.append(name)
+            
+            if failed:
+                self.logger.error(f"Repair failed for: {', '.join(failed)}")
+            else:
+                self.logger.success("Drift repaired")
+            return drifted, failed
+            
+        except Exception as e:
+            self.logger.error(f"Reconcile cycle failed: {str(e)}")
+            return [], ['cycle']
+    
     def _print_success_summary(self):
         """Print success summary with business requirements."""
         self.logger.success("Padmini Systems Keycloak Configuration Completed!")
@@ -211,23 +741,43 @@ def main():
     """Main entry point."""
     orchestrator = KeycloakOrchestrator()
     
-    if not orchestrator.initialize():
-        sys.exit(1)
-    
     # Get action from environment
     action = orchestrator.env.ACTION
     
-    if action == 'create':
-        success = orchestrator.create_configuration()
-    elif action == 'destroy':
-        success = orchestrator.destroy_configuration()
-    elif action == 'validate':
-        success = orchestrator.validate_configuration()
-    else:
+    if action not in orchestrator.ACTIONS:
         orchestrator.logger.error(f"Unknown action: {action}")
-        orchestrator.logger.info("Valid actions: create, destroy, validate")
+        orchestrator.logger.info(
+            "Valid actions: create, destroy, validate, plan, reconcile, preflight"
+        )
+        sys.exit(1)
+    
+    # Offline checks first: nothing below waits for Keycloak on bad input
+    if not orchestrator.preflight():
+        orchestrator.logger.error(f"Action '{action}' failed!")
+        sys.exit(1)
+    
+    if action == 'preflight':
+        orchestrator.logger.success(f"Action '{action}' completed successfully!")
+        sys.exit(0)
+    
+    fanout = orchestrator.realm_specs or orchestrator.instance_targets
+    if fanout and action not in orchestrator.FANOUT_ACTIONS:
+        orchestrator.logger.error(
+            f"Action '{action}' runs for a single realm on a single instance; "
+            f"unset REALMS, REALMS_FILE and KEYCLOAK_INSTANCES"
+        )
+        sys.exit(1)
+    
+    if not orchestrator.initialize():
         sys.exit(1)
     
+    if orchestrator.instance_targets:
+        success = orchestrator.run_for_instances(action)
+    else:
+        success = orchestrator.run_action(action)
+        orchestrator.keycloak_client.log_http_report()
+        orchestrator.keycloak_client.close()
+    
     if success:
         orchestrator.logger.success(f"Action '{action}' completed successfully!")
         sys.exit(0)
@@ -0,0 +1,65 @@
+"""
+Async Keycloak REST API Client
+Asyncio facade over the blocking KeycloakClient, thread-bounded concurrency
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List
+from utils.logger import PadminiLogger
+
+
+class AsyncKeycloakClient:
+    """
+    Asyncio facade over the Keycloak Admin REST API Client.
+    
+    Exposes every public method of the wrapped KeycloakClient
+    (create_client_scope, create_protocol_mapper, assign_default_client_scope,
+    ...) as a coroutine with the same name and arguments. This is not a
+    native asyncio HTTP client: each call runs the blocking ``requests``
+    method in ``run_in_executor`` on a pool of ``max_in_flight`` threads
+    (KEYCLOAK_MAX_IN_FLIGHT). The threads share the wrapped client's pooled
+    session and token, so concurrency is bounded by that thread count no
+    matter how many coroutines are gathered.
+    """
+    
+    def __init__(self, keycloak_client, max_in_flight: int = 8):
+        self.keycloak_client = keycloak_client
+        self.max_in_flight = max(1, max_in_flight)
+        self.logger = PadminiLogger(__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight,
+            thread_name_prefix='keycloak-io'
+        )
+    
+    async def call(self, method_name: str, *args, **kwargs) -> Any:
+        """Run a blocking KeycloakClient method without blocking the loop."""
+        method = getattr(self.keycloak_client, method_name)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(method, *args, **kwargs)
+        )
+    
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        """Expose KeycloakClient methods as coroutines."""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        
+        target = getattr(self.keycloak_client, name)
+        if not callable(target):
+            raise AttributeError(name)
+        
+        async def method(*args, **kwargs):
+            return await self.call(name, *args, **kwargs)
+        
+        method.__name__ = name
+        method.__doc__ = target.__doc__
+        return method
+    
+    async def gather(self, *aws: Awaitable[Any]) -> List[Any]:
+        """Await independent calls concurrently, results in input order."""
+        return list(await asyncio.gather(*aws))
+    
+    def close(self):
+        """Release executor threads."""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,101 @@
+"""
+Run Checkpoints
+Completed steps and resolved IDs kept across Job retries
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, Optional, Set
+from utils.logger import PadminiLogger
+
+
+class CheckpointStore:
+    """
+    JSON checkpoint of a create run.
+    
+    Lives on a volume that survives container restarts (an emptyDir with
+    ``restartPolicy: OnFailure``). A checkpoint belongs to one desired-state
+    digest: a retry with different configuration or code starts over.
+    Without a path every method is a no-op.
+    """
+    
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.logger = PadminiLogger(__name__)
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = self._empty(None)
+    
+    @staticmethod
+    def _empty(digest: Optional[str]) -> Dict[str, Any]:
+        return {'digest': digest, 'completed': [], 'created_realms': [], 'ids': {}}
+    
+    @property
+    def completed(self) -> Set[str]:
+        """Steps finished by an earlier attempt of this run."""
+        return set(self._state['completed'])
+    
+    @property
+    def created_realms(self) -> Set[str]:
+        """Realms created by an earlier attempt of this run."""
+        return set(self._state['created_realms'])
+    
+    @property
+    def ids(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """Realm → resource type → name → ID resolved so far."""
+        return self._state['ids']
+    
+    def load(self, digest: str) -> bool:
+        """Read the checkpoint; True when it continues a run of this digest."""
+        self._state = self._empty(digest)
+        if not self.path or not os.path.exists(self.path):
+            return False
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint {self.path}: {str(e)}")
+            return False
+        
+        if state.get('digest') != digest:
+            self.logger.info("Checkpoint is for another desired state, starting over")
+            return False
+        
+        self._state.update(state)
+        return bool(self._state['completed'])
+    
+    def complete(
+        self,
+        step: str,
+        created_realms: Iterable[str],
+        ids: Dict[str, Dict[str, Dict[str, str]]]
+    ):
+        """Record a finished step with the realms and IDs known so far."""
+        if not self.path:
+            return
+        
+        with self._lock:
+            if step not in self._state['completed']:
+                self._state['completed'].append(step)
+            self._state['created_realms'] = sorted(
+                set(self._state['created_realms']) | set(created_realms)
+            )
+            self._state['ids'] = ids
+            self._write()
+    
+    def clear(self):
+        """Drop the checkpoint once the run has succeeded."""
+        self._state = self._empty(self._state['digest'])
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+    
+    def _write(self):
+        # Replace atomically: a crash mid-write leaves the old checkpoint
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # Only costs re-running the step on a retry
+            self.logger.warning(f"Failed to write checkpoint {self.path}: {str(e)}")
@@ -0,0 +1,86 @@
+"""
+Desired-State Fingerprints
+Stable content hashes recorded in resource attributes
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+# Attribute holding the fingerprint of the desired state last converged
+FINGERPRINT_ATTRIBUTE = 'padmini.fingerprint'
+
+# Realm attribute holding the digest of the last successful create run
+RUN_DIGEST_ATTRIBUTE = 'padmini.run-digest'
+
+# Keys left out of every hash: fingerprints are readable in resource
+# attributes, and an unsalted hash over a secret can be brute-forced
+SECRET_FIELDS = frozenset({'secret', 'password'})
+
+
+def redact_secrets(value: Any) -> Any:
+    """Copy of value without SECRET_FIELDS keys, at any depth."""
+    if isinstance(value, dict):
+        return {
+            key: redact_secrets(item)
+            for key, item in value.items() if key not in SECRET_FIELDS
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact_secrets(item) for item in value]
+    return value
+
+
+def fingerprint(desired: Any) -> str:
+    """
+    SHA-256 of the canonical JSON form (sorted keys, no whitespace).
+    
+    Secrets are redacted first, so rotating one alone does not change
+    the fingerprint.
+    """
+    canonical = json.dumps(
+        redact_secrets(desired),
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def source_fingerprint(root: str) -> str:
+    """
+    Hash of the Python sources under root, standing in for a version.
+    
+    Computed once per process; every realm and instance digest reuses it.
+    """
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != '__pycache__')
+        for filename in sorted(filenames):
+            if not filename.endswith('.py'):
+                continue
+            path = os.path.join(dirpath, filename)
+            digest.update(os.path.relpath(path, root).encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def stored_fingerprint(
+    representation: Dict[str, Any],
+    attribute: str = FINGERPRINT_ATTRIBUTE
+) -> Optional[str]:
+    """Fingerprint recorded on a resource, if any."""
+    return (representation.get('attributes') or {}).get(attribute)
+
+
+def fingerprint_update(
+    value: str,
+    attribute: str = FINGERPRINT_ATTRIBUTE
+) -> Dict[str, Any]:
+    """
+    Partial representation that records a fingerprint.
+    
+    Keycloak sets the attributes sent in an update and keeps the others,
+    so this touches nothing but the fingerprint.
+    """
+    return {'attributes': {attribute: value}}
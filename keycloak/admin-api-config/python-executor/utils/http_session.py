@@ -0,0 +1,107 @@
+"""
+HTTP Session
+Pooled requests session with keep-alive tuning and utilization stats
+"""
+import socket
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from utils.logger import PadminiLogger
+
+
+@dataclass
+class PoolSettings:
+    """Connection pool and keep-alive settings for the admin session."""
+    # Number of per-host pools kept (one host in practice, plus token/health)
+    pool_connections: int = 4
+    # Connections kept open per host; should be >= request concurrency
+    pool_maxsize: int = 16
+    # Wait for a free pooled connection instead of opening a throwaway one
+    pool_block: bool = True
+    # TCP keep-alive idle time in seconds (0 disables the socket option)
+    keepalive_idle: int = 60
+    # Ask for gzip-compressed responses
+    compression: bool = True
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive on pooled sockets."""
+    
+    def __init__(self, keepalive_idle: int = 60, **kwargs):
+        self.keepalive_idle = keepalive_idle
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        if self.keepalive_idle > 0:
+            kwargs['socket_options'] = (
+                HTTPConnection.default_socket_options + self._keepalive_options()
+            )
+        super().init_poolmanager(*args, **kwargs)
+    
+    def _keepalive_options(self) -> List[Tuple[int, int, int]]:
+        options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        # Idle/interval knobs are platform specific (Linux names first)
+        idle = getattr(socket, 'TCP_KEEPIDLE', getattr(socket, 'TCP_KEEPALIVE', None))
+        if idle is not None:
+            options.append((socket.IPPROTO_TCP, idle, self.keepalive_idle))
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            options.append((
+                socket.IPPROTO_TCP, socket.TCP_KEEPINTVL,
+                max(1, self.keepalive_idle // 4)
+            ))
+        return options
+    
+    def utilization(self) -> Dict[str, Tuple[int, int]]:
+        """Per host: (connections opened, requests sent) by this adapter."""
+        stats = {}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            stats[host] = (pool.num_connections, pool.num_requests)
+        return stats
+
+
+def create_session(settings: PoolSettings) -> requests.Session:
+    """JSON session whose http(s) adapters use the given pool settings."""
+    session = requests.Session()
+    session.headers.update({
+        'Content-Type': 'application/json',
+        'Accept': 'application/json',
+        'Accept-Encoding': 'gzip, deflate' if settings.compression else 'identity',
+        'Connection': 'keep-alive'
+    })
+    
+    for prefix in ('https://', 'http://'):
+        session.mount(prefix, KeepAliveAdapter(
+            keepalive_idle=settings.keepalive_idle,
+            pool_connections=settings.pool_connections,
+            pool_maxsize=settings.pool_maxsize,
+            pool_block=settings.pool_block
+        ))
+    return session
+
+
+def log_pool_report(session: requests.Session):
+    """Print connections opened vs reused per host."""
+    logger = PadminiLogger(__name__)
+    totals: Dict[str, Tuple[int, int]] = {}
+    for adapter in set(session.adapters.values()):
+        if isinstance(adapter, KeepAliveAdapter):
+            totals.update(adapter.utilization())
+    
+    if not totals:
+        return
+    
+    logger.info("🔌 Connection pool utilization:")
+    for host, (opened, sent) in sorted(totals.items()):
+        reused = max(0, sent - opened)
+        ratio = reused / sent * 100 if sent else 0.0
+        logger.info(
+            f"   {host}: {sent} requests, {opened} connections opened, "
+            f"{reused} reused ({ratio:.0f}%)"
+        )
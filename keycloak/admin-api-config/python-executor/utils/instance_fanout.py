@@ -0,0 +1,84 @@
+"""
+Instance Fan-out
+Applies the same desired state to several Keycloak instances at once
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict
+from utils.logger import PadminiLogger
+
+
+@dataclass
+class InstanceResult:
+    """Outcome, timing and drift of one instance's run."""
+    name: str
+    success: bool = False
+    duration: float = 0.0
+    requests: int = 0
+    # Plan changes applied, i.e. how far the instance had drifted
+    changes: int = 0
+    retries: int = 0
+
+
+class InstanceFanout:
+    """
+    Runs one action per Keycloak instance, all instances at once.
+    
+    Every instance has its own client (connection pool, token, readiness
+    wait and circuit breaker), so a slow or unreachable cluster only
+    delays its own row of the report; the run takes as long as the
+    slowest instance.
+    """
+    
+    def __init__(self):
+        self.logger = PadminiLogger(__name__)
+    
+    def run(
+        self,
+        actions: Dict[str, Callable[[], bool]],
+        stats: Callable[[str], Dict[str, int]]
+    ) -> Dict[str, InstanceResult]:
+        """Run every instance's action; stats give its counters afterwards."""
+        results = {name: InstanceResult(name) for name in actions}
+        
+        def execute(name: str):
+            result = results[name]
+            started = time.monotonic()
+            try:
+                result.success = bool(actions[name]())
+            except Exception as e:
+                self.logger.error(f"Instance '{name}' raised: {str(e)}")
+            finally:
+                result.duration = time.monotonic() - started
+                counters = stats(name)
+                result.requests = counters.get('requests', 0)
+                result.changes = counters.get('changes', 0)
+                result.retries = counters.get('retries', 0)
+        
+        with ThreadPoolExecutor(
+            max_workers=max(1, len(actions)),
+            thread_name_prefix='keycloak-instance'
+        ) as pool:
+            list(pool.map(execute, actions))
+        return results
+    
+    def log_report(self, results: Dict[str, InstanceResult]):
+        """Print a per-instance status, drift and timing table."""
+        self.logger.info("🌐 Instance report:")
+        for result in results.values():
+            status = "ok" if result.success else "failed"
+            if result.changes:
+                drift = f"{result.changes} change(s)"
+            else:
+                drift = "in sync" if result.success else "unknown"
+            self.logger.info(
+                f"   {result.name:<16} {result.duration:7.2f}s  {status:<6}  "
+                f"{drift:<14} {result.requests} requests, {result.retries} retries"
+            )
+        
+        slowest = max(results.values(), key=lambda r: r.duration, default=None)
+        if slowest:
+            self.logger.info(
+                f"   Slowest: {slowest.name} ({slowest.duration:.2f}s)"
+            )
@@ -0,0 +1,176 @@
+"""
+JSON Codec
+Pluggable JSON encode/decode with a streaming parser for array responses
+"""
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, List
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is used when orjson is missing
+    orjson = None
+
+
+class JsonCodec:
+    """Encodes request bodies to bytes and decodes response bytes."""
+    
+    name = 'json'
+    
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+    
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+class OrjsonCodec(JsonCodec):
+    """orjson-backed codec: several times faster, fewer temporary objects."""
+    
+    name = 'orjson'
+    
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+    
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+CODECS = {'json': JsonCodec}
+if orjson is not None:
+    CODECS['orjson'] = OrjsonCodec
+
+
+def get_codec(name: str = 'auto') -> JsonCodec:
+    """Codec by name; 'auto' picks the fastest one installed."""
+    if name == 'auto':
+        name = 'orjson' if 'orjson' in CODECS else 'json'
+    if name not in CODECS:
+        raise ValueError(
+            f"JSON codec '{name}' not available (installed: {sorted(CODECS)})"
+        )
+    return CODECS[name]()
+
+
+# Insignificant whitespace between JSON tokens
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Characters that can continue a number: "1", "1." and "1e" all decode
+# as a number but may be the start of a longer one
+_NUMBER_CHARS = frozenset('+-.0123456789eE')
+
+
+class JsonArrayParser:
+    """
+    Incremental parser for a top-level JSON array.
+    
+    Chunks are fed as they arrive off the socket. Each element is decoded
+    with the stdlib's C scanner (``raw_decode``) as soon as it is complete,
+    and only the unfinished tail is kept, so memory is bounded by the
+    largest element rather than by the whole array.
+    
+    An element spanning many chunks is not re-decoded on every chunk:
+    after a failed attempt the chunks are only collected, and decoding is
+    retried once the pending text has doubled (or the stream ends). Each
+    element is therefore scanned a constant number of times on average.
+    """
+    
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        # Text not consumed yet, as received; joined only to decode
+        self._pending: List[str] = []
+        self._pending_size = 0
+        # Pending size at which decoding the unfinished element is retried
+        self._retry_size = 0
+        # 'open': before '[', 'first': after '[', 'value': after ',',
+        # 'separator': after an element
+        self._state = 'open'
+        self.done = False
+    
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Consume a chunk and return the elements it completed."""
+        text = self._text.decode(chunk, final)
+        if self.done:
+            if text.strip():
+                raise ValueError("Data after the end of the JSON array")
+            return []
+        
+        if text:
+            self._pending.append(text)
+            self._pending_size += len(text)
+        if self._pending_size < self._retry_size and not final:
+            return []
+        buffer = ''.join(self._pending)
+        
+        items = []
+        pos = 0
+        incomplete = False
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            
+            if self._state == 'open':
+                if char != '[':
+                    raise ValueError("Response is not a JSON array")
+                self._state = 'first'
+                pos += 1
+                continue
+            
+            if self._state == 'separator' or (self._state == 'first' and char == ']'):
+                if char == ',' and self._state == 'separator':
+                    self._state = 'value'
+                    pos += 1
+                    continue
+                if char != ']':
+                    raise ValueError(f"Expected ',' or ']' at '{buffer[pos:pos + 20]}'")
+                self.done = True
+                if buffer[pos + 1:].strip():
+                    raise ValueError("Data after the end of the JSON array")
+                pos = len(buffer)
+                break
+            
+            try:
+                item, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                incomplete = True  # Element not complete yet
+                break
+            if (
+                not final
+                and (end == len(buffer) or buffer[end] in _NUMBER_CHARS)
+                and type(item) in (int, float)
+            ):
+                # A number cut at a chunk boundary ("1", "-2.", "3e")
+                # decodes short; wait for the delimiter after it
+                incomplete = True
+                break
+            items.append(item)
+            self._state = 'separator'
+            pos = end
+        
+        rest = buffer[pos:]
+        self._pending = [rest] if rest else []
+        self._pending_size = len(rest)
+        self._retry_size = 2 * len(rest) if incomplete else 0
+        return items
+    
+    def close(self) -> List[Any]:
+        """Flush the last chunk and check the array was complete."""
+        items = self.feed(b'', final=True)
+        if not self.done:
+            raise ValueError("Truncated JSON array")
+        return items
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Yield the elements of a JSON array from a stream of byte chunks."""
+    parser = JsonArrayParser()
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
+    yield from parser.close()
@@ -4,27 +4,111 @@ Handles all HTTP interactions with Keycloak Admin API
 """
 import requests
 import json
-import time
-from typing import Dict, Any, Optional, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+from urllib.parse import urlencode
 from utils.logger import PadminiLogger
+from utils.async_keycloak_client import AsyncKeycloakClient
+from utils.json_codec import get_codec, iter_json_array
+from utils.http_session import PoolSettings, create_session, log_pool_report
+from utils.resource_index import RESOURCE_KEYS, ResourceIndex
+from utils.readiness import ReadinessProbe
+from utils.token_manager import TokenManager
+from utils.transport import Transport, TransportPolicy
+
+
+class KeycloakPagingError(Exception):
+    """A listing (or one of its pages) could not be fetched completely."""
 
 
 class KeycloakClient:
     """Keycloak Admin REST API Client."""
     
-    def __init__(self, server_url: str, username: str, password: str):
+    def __init__(
+        self,
+        server_url: str,
+        username: str,
+        password: str,
+        max_in_flight: int = 8,
+        token_refresh_margin: float = 30.0,
+        ready_timeout: float = 300.0,
+        health_url: Optional[str] = None,
+        transport_policy: Optional[TransportPolicy] = None,
+        pool_settings: Optional[PoolSettings] = None,
+        page_size: int = 100,
+        json_codec: str = 'auto'
+    ):
         self.server_url = server_url.rstrip('/')
         self.username = username
         self.password = password
-        self.access_token = None
+        self.max_in_flight = max_in_flight
+        self.page_size = max(1, page_size)
+        self.codec = get_codec(json_codec)
         self.logger = PadminiLogger(__name__)
+        self._aio = None
+        self._aio_lock = threading.Lock()
+        
+        # Name → ID index shared by all managers for this run
+        self.index = ResourceIndex(self)
+        
+        # Realms this client created during the run (fresh installs)
+        self.created_realms = set()
+        
+        # Plan changes applied through this client: how far it had drifted
+        self.applied_changes = 0
+        self._applied_lock = threading.Lock()
         
         # Session for connection pooling
-        self.session = requests.Session()
-        self.session.headers.update({
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+        self.session = create_session(pool_settings or PoolSettings())
+        
+        # Timeouts, retries and circuit breaker for every API call
+        self.transport = Transport(self.session, transport_policy)
+        
+        # Access token lifecycle (refresh ahead of expiry, re-auth)
+        self.tokens = TokenManager(
+            self.server_url, username, password, self.transport,
+            refresh_margin=token_refresh_margin
+        )
+        
+        # Startup readiness wait over the same pooled session
+        self.readiness = ReadinessProbe(
+            self.server_url, self.session,
+            deadline=ready_timeout, health_url=health_url
+        )
+    
+    @property
+    def access_token(self) -> Optional[str]:
+        """Current admin access token."""
+        return self.tokens.access_token
+    
+    @property
+    def aio(self) -> AsyncKeycloakClient:
+        """Shared asyncio view of this client for concurrent fan-out."""
+        # Realm and instance workers reach this concurrently: build one
+        # facade (and one executor) only
+        with self._aio_lock:
+            if self._aio is None:
+                self._aio = AsyncKeycloakClient(self, self.max_in_flight)
+            return self._aio
+    
+    def record_applied(self, count: int):
+        """Count changes applied by a manager (called from worker threads)."""
+        with self._applied_lock:
+            self.applied_changes += count
+    
+    def log_http_report(self):
+        """Print retry, circuit breaker and connection pool statistics."""
+        self.transport.log_report()
+        log_pool_report(self.session)
+    
+    def close(self):
+        """Release pooled connections and async workers."""
+        with self._aio_lock:
+            if self._aio is not None:
+                self._aio.close()
+                self._aio = None
+        self.session.close()
     
     def connect(self) -> bool:
         """Authenticate and get access token."""
@@ -36,72 +120,56 @@ class KeycloakClient:
                 return False
             
             # Get access token
-            token_url = f"{self.server_url}/realms/master/protocol/openid-connect/token"
-            
-            data = {
-                'grant_type': 'password',
-                'client_id': 'admin-cli',
-                'username': self.username,
-                'password': self.password
-            }
-            
-            response = self.session.post(
-                token_url,
-                data=data,
-                headers={'Content-Type': 'application/x-www-form-urlencoded'}
-            )
-            
-            if response.status_code == 200:
-                token_data = response.json()
-                self.access_token = token_data['access_token']
-                
-                # Update session headers
-                self.session.headers.update({
-                    'Authorization': f'Bearer {self.access_token}'
-                })
-                
+            if self.tokens.authenticate():
                 self.logger.success("Keycloak authentication successful")
                 return True
             else:
-                self.logger.error(f"Authentication failed: {response.text}")
+                self.logger.error("Authentication failed")
                 return False
                 
         except Exception as e:
             self.logger.error(f"Authentication error: {str(e)}")
             return False
     
-    def _wait_for_keycloak(self, max_attempts: int = 30) -> bool:
+    def _wait_for_keycloak(self) -> bool:
         """Wait for Keycloak to be ready."""
-        self.logger.start_operation("Waiting for Keycloak readiness")
+        return self.readiness.wait()
+    
+    def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
+        """Authenticated Admin API request, retried once after a 401."""
+        url = f"{self.server_url}/admin{endpoint}"
+        request_class = self._request_class(method, endpoint)
+        token = self.tokens.get_token()
+        response = self.transport.send(
+            method, url, request_class,
+            headers={'Authorization': f'Bearer {token}'}, **kwargs
+        )
         
-        for attempt in range(max_attempts):
-            try:
-                # Check if admin endpoint is accessible
-                admin_url = f"{self.server_url}/admin"
-                response = requests.get(admin_url, timeout=5)
-                
-                # Any response (even 401/403) means Keycloak is running
-                if response.status_code in [200, 401, 403]:
-                    self.logger.success("Keycloak is ready")
-                    return True
-                    
-            except Exception as e:
-                self.logger.debug(f"Attempt {attempt + 1}/{max_attempts}: {str(e)}")
-            
-            self.logger.debug(f"Attempt {attempt + 1}/{max_attempts}, retrying...")
-            time.sleep(10)
+        if response.status_code == 401:
+            # Token expired or was revoked: renew once, transparently
+            response.close()
+            token = self.tokens.invalidate(token)
+            response = self.transport.send(
+                method, url, request_class,
+                headers={'Authorization': f'Bearer {token}'}, **kwargs
+            )
         
-        self.logger.error("Keycloak not ready after maximum attempts")
-        return False
+        return response
+    
+    @staticmethod
+    def _request_class(method: str, endpoint: str) -> str:
+        """Timeout class of a call: realm-wide exports/imports are slow."""
+        if endpoint.endswith(('/partial-export', '/partialImport')):
+            return 'bulk'
+        return 'read' if method.upper() == 'GET' else 'write'
     
     def get(self, endpoint: str) -> Optional[Dict[str, Any]]:
         """GET request to Keycloak API."""
         try:
-            url = f"{self.server_url}/admin{endpoint}"
-            response = self.session.get(url)
+            response = self._request('GET', endpoint)
             
             if response.status_code == 200:
-                return response.json()
+                return self.codec.loads(response.content)
             elif response.status_code == 404:
                 return None
             else:
@@ -115,12 +183,11 @@ class KeycloakClient:
     def post(self, endpoint: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """POST request to Keycloak API."""
         try:
-            url = f"{self.server_url}/admin{endpoint}"
-            response = self.session.post(url, json=data)
+            response = self._request('POST', endpoint, data=self.codec.dumps(data))
             
             if response.status_code in [200, 201]:
                 if response.content:
-                    return response.json()
+                    return self.codec.loads(response.content)
                 else:
                     # Extract ID from Location header if present
                     location = response.headers.get('Location', '')
@@ -144,8 +211,7 @@ class KeycloakClient:
     def put(self, endpoint: str, data: Dict[str, Any]) -> bool:
         """PUT request to Keycloak API."""
         try:
-            url = f"{self.server_url}/admin{endpoint}"
-            response = self.session.put(url, json=data)
+            response = self._request('PUT', endpoint, data=self.codec.dumps(data))
             
             if response.status_code in [200, 204]:
                 return True
@@ -160,8 +226,7 @@ class KeycloakClient:
     def delete(self, endpoint: str) -> bool:
         """DELETE request to Keycloak API."""
         try:
-            url = f"{self.server_url}/admin{endpoint}"
-            response = self.session.delete(url)
+            response = self._request('DELETE', endpoint)
             
             if response.status_code in [200, 204]:
                 return True
@@ -179,10 +244,124 @@ class KeycloakClient:
             self.logger.error(f"DELETE {endpoint} error: {str(e)}")
             return False
     
+    # Paged Listing Operations
+    def iter_paged(
+        self,
+        endpoint: str,
+        page_size: Optional[int] = None,
+        **params
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a list endpoint page by page using ``first``/``max``.
+        
+        The next page is fetched in the background while the caller
+        consumes the current one, so at most two pages are held in memory
+        whatever the realm size. Raises KeycloakPagingError if a page
+        fails, rather than ending early with a truncated listing.
+        """
+        page_size = page_size or self.page_size
+        params = {key: value for key, value in params.items() if value is not None}
+        
+        def fetch(first: int) -> List[Dict[str, Any]]:
+            query = urlencode({**params, 'first': first, 'max': page_size})
+            separator = '&' if '?' in endpoint else '?'
+            page = self.get(f"{endpoint}{separator}{query}")
+            if page is None:
+                raise KeycloakPagingError(f"GET {endpoint} failed at offset {first}")
+            return page
+        
+        # Dedicated thread: iterators may run inside the shared aio executor
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='keycloak-page') as prefetch:
+            first = 0
+            upcoming = prefetch.submit(fetch, first)
+            while upcoming is not None:
+                page = upcoming.result()
+                first += len(page)
+                upcoming = (
+                    prefetch.submit(fetch, first) if len(page) >= page_size else None
+                )
+                yield from page
+    
+    def iter_array(self, endpoint: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream an unpaged array response, decoding elements off the socket.
+        
+        Only the element being read is buffered, so large listings and
+        exports of collections do not need the whole body in memory.
+        """
+        response = self._request('GET', endpoint, stream=True)
+        try:
+            if response.status_code != 200:
+                raise KeycloakPagingError(
+                    f"GET {endpoint} failed: HTTP {response.status_code}"
+                )
+            yield from iter_json_array(
+                response.iter_content(chunk_size=64 * 1024)
+            )
+        finally:
+            response.close()
+    
+    def iter_users(self, realm_name: str, **filters) -> Iterator[Dict[str, Any]]:
+        """Stream users, optionally filtered (search, username, email, ...)."""
+        return self.iter_paged(f'/realms/{realm_name}/users', **filters)
+    
+    def iter_groups(self, realm_name: str, **filters) -> Iterator[Dict[str, Any]]:
+        """Stream top-level groups."""
+        return self.iter_paged(f'/realms/{realm_name}/groups', **filters)
+    
+    def iter_clients(self, realm_name: str, **filters) -> Iterator[Dict[str, Any]]:
+        """Stream clients."""
+        return self.iter_paged(f'/realms/{realm_name}/clients', **filters)
+    
+    def iter_events(self, realm_name: str, **filters) -> Iterator[Dict[str, Any]]:
+        """Stream login events, newest first (type, client, user, dateFrom, ...)."""
+        return self.iter_paged(f'/realms/{realm_name}/events', **filters)
+    
+    # Create Operations
+    def create_resource(
+        self,
+        realm_name: str,
+        resource_type: str,
+        representation: Dict[str, Any],
+        resolve_existing: bool = True
+    ) -> Tuple[Optional[str], Optional[bool]]:
+        """
+        POST a client scope, client or group without checking first.
+        
+        Returns ``(id, True)`` when created, with the ID taken from the
+        Location header, and ``(existing id, False)`` on 409, resolved
+        through the index unless ``resolve_existing`` is off (the ID is then
+        None). ``(None, None)`` means the request failed.
+        """
+        name = representation[RESOURCE_KEYS[resource_type]]
+        result = self.post(f'/realms/{realm_name}/{resource_type}', representation)
+        if not result:
+            return None, None
+        
+        if not result.get('exists'):
+            resource_id = result.get('id')
+            if resource_id:
+                self.index.record(realm_name, resource_type, name, resource_id)
+            return resource_id, True
+        
+        if not resolve_existing:
+            return None, False
+        
+        # Conflict: only now look the existing resource up
+        resource_id = self.index.get_id(realm_name, resource_type, name)
+        if resource_id is None:
+            # Index was loaded before the resource appeared: relist once
+            self.index.invalidate(realm_name, resource_type)
+            resource_id = self.index.get_id(realm_name, resource_type, name)
+        return resource_id, False
+    
     # Realm Operations
     def create_realm(self, realm_config: Dict[str, Any]) -> bool:
-        """Create a new realm."""
-        return self.post('/realms', realm_config) is not None
+        """Create a new realm (an existing realm also counts as success)."""
+        result = self.post('/realms', realm_config)
+        if result and not result.get('exists'):
+            self.created_realms.add(realm_config['realm'])
+        return result is not None
     
     def get_realm(self, realm_name: str) -> Optional[Dict[str, Any]]:
         """Get realm configuration."""
@@ -194,7 +373,46 @@ class KeycloakClient:
     
     def delete_realm(self, realm_name: str) -> bool:
         """Delete a realm."""
-        return self.delete(f'/realms/{realm_name}')
+        deleted = self.delete(f'/realms/{realm_name}')
+        if deleted:
+            self.index.invalidate(realm_name)
+            self.created_realms.discard(realm_name)
+        return deleted
+    
+    def partial_export(
+        self,
+        realm_name: str,
+        export_clients: bool = True,
+        export_groups_and_roles: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Export realm settings with clients, scopes, roles and groups."""
+        endpoint = (
+            f'/realms/{realm_name}/partial-export'
+            f'?exportClients={str(export_clients).lower()}'
+            f'&exportGroupsAndRoles={str(export_groups_and_roles).lower()}'
+        )
+        result = self.post(endpoint, {})
+        return result if result and 'realm' in result else None
+    
+    def partial_import(
+        self,
+        realm_name: str,
+        payload: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Import clients, roles and groups into a realm in one request."""
+        result = self.post(f'/realms/{realm_name}/partialImport', payload)
+        if not result or result.get('exists'):
+            # 409 means ifResourceExists=FAIL hit an existing resource
+            return None
+        
+        index_types = {'CLIENT': 'clients', 'REALM_ROLE': 'roles', 'GROUP': 'groups'}
+        for item in result.get('results', []):
+            resource_type = index_types.get(item.get('resourceType'))
+            if resource_type and item.get('id'):
+                self.index.record(
+                    realm_name, resource_type, item['resourceName'], item['id']
+                )
+        return result
     
     # Client Scope Operations
     def create_client_scope(
@@ -202,9 +420,20 @@ class KeycloakClient:
         realm_name: str,
         scope_config: Dict[str, Any]
     ) -> Optional[str]:
-        """Create client scope and return ID."""
-        result = self.post(f'/realms/{realm_name}/client-scopes', scope_config)
-        return result.get('id') if result else None
+        """Create client scope and return its ID (or the existing one's)."""
+        scope_id, _ = self.create_resource(realm_name, 'client-scopes', scope_config)
+        return scope_id
+    
+    def get_client_scopes(self, realm_name: str) -> Optional[List[Dict[str, Any]]]:
+        """List client scopes, including their protocol mappers."""
+        scopes = self.get(f'/realms/{realm_name}/client-scopes')
+        if scopes is not None:
+            self.index.populate(realm_name, 'client-scopes', scopes)
+        return scopes
+    
+    def get_client_scope_id(self, realm_name: str, scope_name: str) -> Optional[str]:
+        """Resolve a client scope ID by name through the index."""
+        return self.index.get_id(realm_name, 'client-scopes', scope_name)
     
     def get_client_scope_by_name(
         self,
@@ -212,16 +441,28 @@ class KeycloakClient:
         scope_name: str
     ) -> Optional[Dict[str, Any]]:
         """Get client scope by name."""
-        scopes = self.get(f'/realms/{realm_name}/client-scopes')
-        if scopes:
-            for scope in scopes:
-                if scope.get('name') == scope_name:
-                    return scope
-        return None
+        scope_id = self.get_client_scope_id(realm_name, scope_name)
+        if not scope_id:
+            return None
+        return self.get(f'/realms/{realm_name}/client-scopes/{scope_id}')
+    
+    def update_client_scope(
+        self,
+        realm_name: str,
+        scope_id: str,
+        scope_config: Dict[str, Any]
+    ) -> bool:
+        """Update client scope configuration."""
+        return self.put(
+            f'/realms/{realm_name}/client-scopes/{scope_id}', scope_config
+        )
     
     def delete_client_scope(self, realm_name: str, scope_id: str) -> bool:
         """Delete client scope."""
-        return self.delete(f'/realms/{realm_name}/client-scopes/{scope_id}')
+        deleted = self.delete(f'/realms/{realm_name}/client-scopes/{scope_id}')
+        if deleted:
+            self.index.forget(realm_name, 'client-scopes', resource_id=scope_id)
+        return deleted
     
     # Protocol Mapper Operations
     def create_protocol_mapper(
@@ -234,15 +475,65 @@ class KeycloakClient:
         endpoint = f'/realms/{realm_name}/client-scopes/{scope_id}/protocol-mappers/models'
         return self.post(endpoint, mapper_config) is not None
     
+    def get_protocol_mappers(
+        self,
+        realm_name: str,
+        scope_id: str
+    ) -> Optional[List[Dict[str, Any]]]:
+        """List protocol mappers of a client scope."""
+        return self.get(
+            f'/realms/{realm_name}/client-scopes/{scope_id}/protocol-mappers/models'
+        )
+    
+    def update_protocol_mapper(
+        self,
+        realm_name: str,
+        scope_id: str,
+        mapper_id: str,
+        mapper_config: Dict[str, Any]
+    ) -> bool:
+        """Update protocol mapper (the representation must carry its ID)."""
+        endpoint = (
+            f'/realms/{realm_name}/client-scopes/{scope_id}'
+            f'/protocol-mappers/models/{mapper_id}'
+        )
+        return self.put(endpoint, {**mapper_config, 'id': mapper_id})
+    
+    def delete_protocol_mapper(
+        self,
+        realm_name: str,
+        scope_id: str,
+        mapper_id: str
+    ) -> bool:
+        """Delete protocol mapper."""
+        return self.delete(
+            f'/realms/{realm_name}/client-scopes/{scope_id}'
+            f'/protocol-mappers/models/{mapper_id}'
+        )
+    
     # Client Operations
     def create_client(
         self,
         realm_name: str,
         client_config: Dict[str, Any]
     ) -> Optional[str]:
-        """Create client and return ID."""
-        result = self.post(f'/realms/{realm_name}/clients', client_config)
-        return result.get('id') if result else None
+        """Create client and return its ID (or the existing one's)."""
+        client_uuid, _ = self.create_resource(realm_name, 'clients', client_config)
+        return client_uuid
+    
+    def get_clients(self, realm_name: str) -> Optional[List[Dict[str, Any]]]:
+        """List clients."""
+        try:
+            clients = list(self.iter_clients(realm_name))
+        except KeycloakPagingError as e:
+            self.logger.error(str(e))
+            return None
+        self.index.populate(realm_name, 'clients', clients)
+        return clients
+    
+    def get_client_uuid(self, realm_name: str, client_id: str) -> Optional[str]:
+        """Resolve a client's internal ID by clientId through the index."""
+        return self.index.get_id(realm_name, 'clients', client_id)
     
     def get_client_by_client_id(
         self,
@@ -251,7 +542,10 @@ class KeycloakClient:
     ) -> Optional[Dict[str, Any]]:
         """Get client by clientId."""
         clients = self.get(f'/realms/{realm_name}/clients?clientId={client_id}')
-        return clients[0] if clients else None
+        if not clients:
+            return None
+        self.index.record(realm_name, 'clients', client_id, clients[0]['id'])
+        return clients[0]
     
     def update_client(
         self,
@@ -264,7 +558,10 @@ class KeycloakClient:
     
     def delete_client(self, realm_name: str, client_uuid: str) -> bool:
         """Delete client."""
-        return self.delete(f'/realms/{realm_name}/clients/{client_uuid}')
+        deleted = self.delete(f'/realms/{realm_name}/clients/{client_uuid}')
+        if deleted:
+            self.index.forget(realm_name, 'clients', resource_id=client_uuid)
+        return deleted
     
     # Client Scope Assignment Operations
     def assign_default_client_scope(
@@ -287,6 +584,26 @@ class KeycloakClient:
         endpoint = f'/realms/{realm_name}/clients/{client_uuid}/optional-client-scopes/{scope_id}'
         return self.put(endpoint, {})
     
+    def unassign_default_client_scope(
+        self,
+        realm_name: str,
+        client_uuid: str,
+        scope_id: str
+    ) -> bool:
+        """Remove default client scope from client."""
+        endpoint = f'/realms/{realm_name}/clients/{client_uuid}/default-client-scopes/{scope_id}'
+        return self.delete(endpoint)
+    
+    def unassign_optional_client_scope(
+        self,
+        realm_name: str,
+        client_uuid: str,
+        scope_id: str
+    ) -> bool:
+        """Remove optional client scope from client."""
+        endpoint = f'/realms/{realm_name}/clients/{client_uuid}/optional-client-scopes/{scope_id}'
+        return self.delete(endpoint)
+    
     # Role Operations
     def create_realm_role(
         self,
@@ -294,11 +611,39 @@ class KeycloakClient:
         role_config: Dict[str, Any]
     ) -> bool:
         """Create realm role."""
-        return self.post(f'/realms/{realm_name}/roles', role_config) is not None
+        result = self.post(f'/realms/{realm_name}/roles', role_config)
+        if result and result.get('id') and self.index.is_loaded(realm_name, 'roles'):
+            # Location ends in the role name, not its ID: read the UUID back,
+            # and only when there is an index to keep current
+            role = self.get(f"/realms/{realm_name}/roles/{role_config['name']}")
+            if role and role.get('id'):
+                self.index.record(
+                    realm_name, 'roles', role_config['name'], role['id']
+                )
+        return result is not None
+    
+    def get_realm_roles(self, realm_name: str) -> Optional[List[Dict[str, Any]]]:
+        """List realm roles."""
+        roles = self.get(f'/realms/{realm_name}/roles')
+        if roles is not None:
+            self.index.populate(realm_name, 'roles', roles)
+        return roles
+    
+    def update_realm_role(
+        self,
+        realm_name: str,
+        role_name: str,
+        role_config: Dict[str, Any]
+    ) -> bool:
+        """Update realm role."""
+        return self.put(f'/realms/{realm_name}/roles/{role_name}', role_config)
     
     def delete_realm_role(self, realm_name: str, role_name: str) -> bool:
         """Delete realm role."""
-        return self.delete(f'/realms/{realm_name}/roles/{role_name}')
+        deleted = self.delete(f'/realms/{realm_name}/roles/{role_name}')
+        if deleted:
+            self.index.forget(realm_name, 'roles', name=role_name)
+        return deleted
     
     # Group Operations
     def create_group(
@@ -306,13 +651,30 @@ class KeycloakClient:
         realm_name: str,
         group_config: Dict[str, Any]
     ) -> Optional[str]:
-        """Create group and return ID."""
-        result = self.post(f'/realms/{realm_name}/groups', group_config)
-        return result.get('id') if result else None
+        """Create group and return its ID (or the existing one's)."""
+        group_id, _ = self.create_resource(realm_name, 'groups', group_config)
+        return group_id
+    
+    def get_groups(self, realm_name: str) -> Optional[List[Dict[str, Any]]]:
+        """List top-level groups."""
+        try:
+            groups = list(self.iter_groups(realm_name))
+        except KeycloakPagingError as e:
+            self.logger.error(str(e))
+            return None
+        self.index.populate(realm_name, 'groups', groups)
+        return groups
+    
+    def get_group_id(self, realm_name: str, group_name: str) -> Optional[str]:
+        """Resolve a top-level group ID by name through the index."""
+        return self.index.get_id(realm_name, 'groups', group_name)
     
     def delete_group(self, realm_name: str, group_id: str) -> bool:
         """Delete group."""
-        return self.delete(f'/realms/{realm_name}/groups/{group_id}')
+        deleted = self.delete(f'/realms/{realm_name}/groups/{group_id}')
+        if deleted:
+            self.index.forget(realm_name, 'groups', resource_id=group_id)
+        return deleted
     
     # User Profile Operations
     def get_user_profile_config(self, realm_name: str) -> Optional[Dict[str, Any]]:
@@ -346,12 +708,15 @@ class KeycloakClient:
             components = self.get(f'/realms/{realm_name}/components?parent={realm_name}&type=org.keycloak.userprofile.UserProfileProvider')
             if components:
                 component_id = components[0]['id']
-                config['id'] = component_id
-                config['providerId'] = 'declarative-user-profile'
-                config['providerType'] = 'org.keycloak.userprofile.UserProfileProvider'
-                config['parentId'] = realm_name
+                component = {
+                    **config,
+                    'id': component_id,
+                    'providerId': 'declarative-user-profile',
+                    'providerType': 'org.keycloak.userprofile.UserProfileProvider',
+                    'parentId': realm_name
+                }
                 
-                return self.put(f'/realms/{realm_name}/components/{component_id}', config)
+                return self.put(f'/realms/{realm_name}/components/{component_id}', component)
             
             return False
             
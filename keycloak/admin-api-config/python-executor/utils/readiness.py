@@ -0,0 +1,108 @@
+"""
+Readiness Probe
+Waits for Keycloak to become ready with jittered exponential backoff
+"""
+import random
+import time
+from typing import List, Optional
+import requests
+from utils.logger import PadminiLogger
+
+
+class ReadinessProbe:
+    """
+    Polls Keycloak readiness until it answers or a deadline passes.
+    
+    Candidates are probed in order: an explicit health URL (Keycloak 25+
+    serves ``/health/ready`` on the management port), ``/health/ready`` on
+    the main port, and the master realm endpoint, which answers once the
+    token endpoint is usable. An endpoint that answers 404 is not exposed
+    by this deployment and is dropped for the rest of the wait.
+    
+    Probes go through the caller's pooled session so the connection used
+    for the first token request is already open.
+    """
+    
+    def __init__(
+        self,
+        server_url: str,
+        session: requests.Session,
+        deadline: float = 300.0,
+        health_url: Optional[str] = None,
+        initial_delay: float = 0.25,
+        max_delay: float = 5.0
+    ):
+        self.server_url = server_url.rstrip('/')
+        self.session = session
+        self.deadline = deadline
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.logger = PadminiLogger(__name__)
+        
+        self.endpoints: List[str] = []
+        if health_url:
+            self.endpoints.append(health_url)
+        self.endpoints += [
+            f"{self.server_url}/health/ready",
+            f"{self.server_url}/realms/master"
+        ]
+        
+        self.waited = 0.0
+        self.attempts = 0
+    
+    def wait(self) -> bool:
+        """Block until Keycloak is ready; False once the deadline passes."""
+        self.logger.start_operation("Waiting for Keycloak readiness")
+        started = time.monotonic()
+        give_up_at = started + self.deadline
+        endpoints = list(self.endpoints)
+        
+        while True:
+            self.attempts += 1
+            remaining = give_up_at - time.monotonic()
+            
+            for url in list(endpoints):
+                status = self._probe(url, timeout=max(0.5, min(5.0, remaining)))
+                if status == 200:
+                    self.waited = time.monotonic() - started
+                    self.logger.success(
+                        f"Keycloak is ready after {self.waited:.2f}s "
+                        f"({self.attempts} probe rounds, via {url})"
+                    )
+                    return True
+                if status == 404 and len(endpoints) > 1:
+                    self.logger.debug(f"{url} not exposed, no longer probing it")
+                    endpoints.remove(url)
+                elif status is not None:
+                    # The endpoint answered "not ready": trust it this round
+                    break
+            
+            delay = self._backoff(self.attempts)
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+            
+            self.logger.debug(
+                f"Probe round {self.attempts}: not ready, retrying in {delay:.2f}s"
+            )
+            time.sleep(min(delay, remaining))
+        
+        self.waited = time.monotonic() - started
+        self.logger.error(
+            f"Keycloak not ready after {self.waited:.0f}s "
+            f"({self.attempts} probe rounds)"
+        )
+        return False
+    
+    def _probe(self, url: str, timeout: float) -> Optional[int]:
+        """Status code of a readiness request, None if it did not connect."""
+        try:
+            return self.session.get(url, timeout=timeout).status_code
+        except requests.RequestException as e:
+            self.logger.debug(f"Probe {url}: {str(e)}")
+            return None
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential delay with full jitter, never below the initial delay."""
+        ceiling = min(self.max_delay, self.initial_delay * (2 ** (attempt - 1)))
+        return random.uniform(self.initial_delay, max(self.initial_delay, ceiling))
@@ -0,0 +1,94 @@
+"""
+Realm Fan-out
+Runs one orchestrator action per tenant realm on a bounded worker pool
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from utils.logger import PadminiLogger
+
+
+@dataclass
+class RealmResult:
+    """Outcome and timing of one realm's run."""
+    realm: str
+    success: bool = False
+    # Not started because the run's time budget was used up
+    skipped: bool = False
+    started: float = 0.0
+    finished: float = 0.0
+    
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class RealmFanout:
+    """
+    Runs per-realm actions concurrently.
+    
+    Realms share the caller's Keycloak client, so the number of requests on
+    the wire stays bounded by its in-flight limit however many realms run.
+    With a time budget, realms not started before it runs out are skipped
+    (and reported) instead of overrunning the Job deadline; a rerun picks
+    them up while finished realms exit early on their run digest.
+    """
+    
+    def __init__(self, max_workers: int = 4, time_budget: Optional[float] = None):
+        self.max_workers = max(1, max_workers)
+        self.time_budget = time_budget or None
+        self.logger = PadminiLogger(__name__)
+    
+    def run(self, actions: Dict[str, Callable[[], bool]]) -> Dict[str, RealmResult]:
+        """Run every realm's action, results in input order."""
+        results = {realm: RealmResult(realm) for realm in actions}
+        origin = time.monotonic()
+        
+        def execute(realm: str):
+            result = results[realm]
+            result.started = time.monotonic() - origin
+            if self.time_budget is not None and result.started > self.time_budget:
+                result.skipped = True
+                result.finished = result.started
+                return
+            
+            try:
+                result.success = bool(actions[realm]())
+            except Exception as e:
+                self.logger.error(f"Realm '{realm}' raised: {str(e)}")
+            finally:
+                result.finished = time.monotonic() - origin
+        
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='keycloak-realm'
+        ) as pool:
+            list(pool.map(execute, actions))
+        return results
+    
+    def log_report(self, results: Dict[str, RealmResult]):
+        """Print a per-realm status and latency table."""
+        ran = [r for r in results.values() if not r.skipped]
+        failed = sum(1 for r in ran if not r.success)
+        skipped = len(results) - len(ran)
+        wall = max((r.finished for r in results.values()), default=0.0)
+        
+        self.logger.info("🏢 Realm report:")
+        for result in results.values():
+            if result.skipped:
+                status = "skipped (time budget)"
+            else:
+                status = "ok" if result.success else "failed"
+            self.logger.info(
+                f"   {result.realm:<32} {result.duration:7.2f}s  {status}"
+            )
+        
+        durations = sorted(r.duration for r in ran)
+        if durations:
+            p95 = durations[min(len(durations) - 1, int(len(durations) * 0.95))]
+            self.logger.info(
+                f"   {len(ran) - failed} ok, {failed} failed, {skipped} skipped; "
+                f"p50 {durations[len(durations) // 2]:.2f}s, p95 {p95:.2f}s, "
+                f"wall {wall:.2f}s"
+            )
@@ -0,0 +1,80 @@
+"""
+Realm Snapshot
+Point-in-time, in-memory copy of a realm's configuration
+"""
+from typing import Dict, Any, List, Optional
+from utils.logger import PadminiLogger
+
+
+class RealmSnapshot:
+    """
+    Realm state fetched with a constant number of Admin API calls.
+    
+    Prefers a single partial export (realm settings, client scopes with
+    their mappers, clients, realm roles and groups). When the export is not
+    permitted it falls back to a fixed set of list endpoints, so the cost
+    never grows with the number of scopes, clients or roles defined.
+    """
+    
+    def __init__(
+        self,
+        realm_name: str,
+        realm: Dict[str, Any],
+        client_scopes: List[Dict[str, Any]],
+        clients: List[Dict[str, Any]],
+        roles: List[Dict[str, Any]],
+        groups: List[Dict[str, Any]]
+    ):
+        self.realm_name = realm_name
+        self.realm = realm
+        self.client_scopes = {scope['name']: scope for scope in client_scopes}
+        self.clients = {client['clientId']: client for client in clients}
+        self.roles = {role['name']: role for role in roles}
+        self.groups = {group['name']: group for group in groups}
+    
+    @classmethod
+    def fetch(cls, keycloak_client, realm_name: str) -> Optional['RealmSnapshot']:
+        """Fetch a snapshot, or None when the realm does not exist."""
+        logger = PadminiLogger(__name__)
+        
+        export = keycloak_client.partial_export(realm_name)
+        if export:
+            logger.debug(f"Snapshot of '{realm_name}' taken from partial export")
+            return cls(
+                realm_name,
+                export,
+                export.get('clientScopes') or [],
+                export.get('clients') or [],
+                (export.get('roles') or {}).get('realm') or [],
+                export.get('groups') or []
+            )
+        
+        realm = keycloak_client.get_realm(realm_name)
+        if not realm:
+            return None
+        
+        logger.debug(f"Snapshot of '{realm_name}' taken from list endpoints")
+        return cls(
+            realm_name,
+            realm,
+            keycloak_client.get_client_scopes(realm_name) or [],
+            keycloak_client.get_clients(realm_name) or [],
+            keycloak_client.get_realm_roles(realm_name) or [],
+            keycloak_client.get_groups(realm_name) or []
+        )
+    
+    def get_client_scope(self, scope_name: str) -> Optional[Dict[str, Any]]:
+        """Client scope by name."""
+        return self.client_scopes.get(scope_name)
+    
+    def get_client(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """Client by clientId."""
+        return self.clients.get(client_id)
+    
+    def get_role(self, role_name: str) -> Optional[Dict[str, Any]]:
+        """Realm role by name."""
+        return self.roles.get(role_name)
+    
+    def get_group(self, group_name: str) -> Optional[Dict[str, Any]]:
+        """Top-level group by name."""
+        return self.groups.get(group_name)
@@ -0,0 +1,127 @@
+"""
+Reconcile Server
+Health and Prometheus metrics endpoints for the reconcile daemon
+"""
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional
+from utils.logger import PadminiLogger
+
+
+class ReconcileMetrics:
+    """Counters and gauges of the reconcile loop, safe to read from the server."""
+    
+    def __init__(self, stale_after: float):
+        # /healthz fails when no cycle has finished for this many seconds
+        self.stale_after = stale_after
+        self.started = time.time()
+        self.cycles = 0
+        self.failed_cycles = 0
+        self.drift = Counter()
+        self.repair_failures = Counter()
+        self.last_cycle_end: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_duration = 0.0
+        self._lock = threading.Lock()
+    
+    def record_cycle(
+        self,
+        duration: float,
+        drifted: Iterable[str],
+        failed: Iterable[str],
+        success: bool
+    ):
+        """Account one finished cycle."""
+        with self._lock:
+            self.cycles += 1
+            self.drift.update(drifted)
+            self.repair_failures.update(failed)
+            self.last_duration = duration
+            self.last_cycle_end = time.time()
+            if success:
+                self.last_success = self.last_cycle_end
+            else:
+                self.failed_cycles += 1
+    
+    def healthy(self) -> bool:
+        """Whether the loop is still cycling (Keycloak errors included)."""
+        with self._lock:
+            last = self.last_cycle_end or self.started
+        return time.time() - last < self.stale_after
+    
+    def render(self, http_stats: Dict[str, int]) -> str:
+        """Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                '# TYPE keycloak_reconcile_cycles_total counter',
+                f'keycloak_reconcile_cycles_total {self.cycles}',
+                '# TYPE keycloak_reconcile_failed_cycles_total counter',
+                f'keycloak_reconcile_failed_cycles_total {self.failed_cycles}',
+                '# TYPE keycloak_reconcile_drift_total counter'
+            ]
+            lines += [
+                f'keycloak_reconcile_drift_total{{component="{name}"}} {count}'
+                for name, count in sorted(self.drift.items())
+            ]
+            lines.append('# TYPE keycloak_reconcile_repair_failures_total counter')
+            lines += [
+                f'keycloak_reconcile_repair_failures_total{{component="{name}"}} {count}'
+                for name, count in sorted(self.repair_failures.items())
+            ]
+            lines += [
+                '# TYPE keycloak_reconcile_last_cycle_duration_seconds gauge',
+                f'keycloak_reconcile_last_cycle_duration_seconds {self.last_duration:.3f}',
+                '# TYPE keycloak_reconcile_last_success_timestamp_seconds gauge',
+                f'keycloak_reconcile_last_success_timestamp_seconds {self.last_success or 0:.0f}'
+            ]
+        
+        lines += [
+            '# TYPE keycloak_http_requests_total counter',
+            f"keycloak_http_requests_total {http_stats.get('requests', 0)}",
+            '# TYPE keycloak_http_retries_total counter',
+            f"keycloak_http_retries_total {http_stats.get('retries', 0)}",
+            '# TYPE keycloak_http_short_circuited_total counter',
+            f"keycloak_http_short_circuited_total {http_stats.get('short_circuited', 0)}"
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+def start_reconcile_server(
+    metrics: ReconcileMetrics,
+    http_stats: Callable[[], Dict[str, int]],
+    port: int,
+    host: str = '0.0.0.0'
+) -> ThreadingHTTPServer:
+    """Serve /healthz and /metrics from a daemon thread."""
+    logger = PadminiLogger(__name__)
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/healthz':
+                healthy = metrics.healthy()
+                self._reply(200 if healthy else 503, 'ok\n' if healthy else 'stalled\n')
+            elif self.path == '/metrics':
+                self._reply(200, metrics.render(http_stats()), 'text/plain; version=0.0.4')
+            else:
+                self._reply(404, 'not found\n')
+        
+        def _reply(self, status: int, body: str, content_type: str = 'text/plain'):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        
+        def log_message(self, format, *args):
+            pass  # Probes every few seconds would drown the reconcile log
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name='reconcile-server', daemon=True
+    ).start()
+    logger.info(f"Serving /healthz and /metrics on {host}:{port}")
+    return server
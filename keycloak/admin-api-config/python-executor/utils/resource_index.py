@@ -0,0 +1,136 @@
+"""
+Resource Index
+Per-run name → ID lookup for client scopes, clients, realm roles and groups
+"""
+import threading
+from typing import Dict, Any, Iterable, Optional, Tuple
+from utils.logger import PadminiLogger
+
+# Resource type → field that identifies a resource by name
+RESOURCE_KEYS = {
+    'client-scopes': 'name',
+    'clients': 'clientId',
+    'roles': 'name',
+    'groups': 'name'
+}
+
+
+class ResourceIndex:
+    """
+    Lazily populated name → ID index for one Keycloak server.
+    
+    Each (realm, resource type) pair is listed at most once per run; after
+    that the index is kept current from create responses (the ID in the
+    Location header) and deletes instead of re-listing.
+    """
+    
+    def __init__(self, keycloak_client):
+        self.keycloak_client = keycloak_client
+        self.logger = PadminiLogger(__name__)
+        self._entries: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._lock = threading.RLock()
+        self._load_locks: Dict[Tuple[str, str], threading.Lock] = {}
+    
+    def get_id(self, realm_name: str, resource_type: str, name: str) -> Optional[str]:
+        """ID of a named resource, listing the resource type on first use."""
+        return self._load(realm_name, resource_type).get(name)
+    
+    def ids(self, realm_name: str, resource_type: str) -> Dict[str, str]:
+        """All known name → ID pairs of a resource type."""
+        return dict(self._load(realm_name, resource_type))
+    
+    def is_loaded(self, realm_name: str, resource_type: str) -> bool:
+        """Whether a resource type has been listed (and is kept current)."""
+        with self._lock:
+            return (realm_name, resource_type) in self._entries
+    
+    def populate(
+        self,
+        realm_name: str,
+        resource_type: str,
+        items: Iterable[Dict[str, Any]]
+    ):
+        """Replace the entries of a resource type from a full listing."""
+        key_field = RESOURCE_KEYS[resource_type]
+        entries = {item[key_field]: item.get('id') for item in items}
+        with self._lock:
+            self._entries[(realm_name, resource_type)] = entries
+    
+    def record(
+        self,
+        realm_name: str,
+        resource_type: str,
+        name: str,
+        resource_id: str
+    ):
+        """Remember a created resource, if its type has been loaded."""
+        with self._lock:
+            entries = self._entries.get((realm_name, resource_type))
+            if entries is not None:
+                entries[name] = resource_id
+    
+    def forget(
+        self,
+        realm_name: str,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        name: Optional[str] = None
+    ):
+        """Drop a deleted resource by ID or by name."""
+        with self._lock:
+            entries = self._entries.get((realm_name, resource_type))
+            if entries is None:
+                return
+            for entry_name, entry_id in list(entries.items()):
+                if entry_name == name or (resource_id and entry_id == resource_id):
+                    del entries[entry_name]
+    
+    def invalidate(self, realm_name: str, resource_type: Optional[str] = None):
+        """Discard what is known about a realm (or one resource type)."""
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == realm_name and resource_type in (None, key[1]):
+                    del self._entries[key]
+    
+    def export(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """Copy of everything loaded: realm → resource type → name → ID."""
+        exported: Dict[str, Dict[str, Dict[str, str]]] = {}
+        with self._lock:
+            for (realm_name, resource_type), entries in self._entries.items():
+                exported.setdefault(realm_name, {})[resource_type] = dict(entries)
+        return exported
+    
+    def restore(self, exported: Dict[str, Dict[str, Dict[str, str]]]):
+        """Load entries saved by export(), e.g. from a run checkpoint."""
+        with self._lock:
+            for realm_name, types in exported.items():
+                for resource_type, entries in types.items():
+                    self._entries[(realm_name, resource_type)] = dict(entries)
+    
+    def _load(self, realm_name: str, resource_type: str) -> Dict[str, str]:
+        """Entries for a resource type, listing them once if unknown."""
+        key = (realm_name, resource_type)
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        
+        # Concurrent callers wait for a single listing instead of repeating it
+        with load_lock:
+            with self._lock:
+                if key in self._entries:
+                    return self._entries[key]
+            
+            self.logger.debug(f"Indexing {resource_type} of realm '{realm_name}'")
+            listers = {
+                'client-scopes': self.keycloak_client.get_client_scopes,
+                'clients': self.keycloak_client.get_clients,
+                'roles': self.keycloak_client.get_realm_roles,
+                'groups': self.keycloak_client.get_groups
+            }
+            # Listing populates the index through the client
+            if listers[resource_type](realm_name) is None:
+                return {}
+        
+        with self._lock:
+            return self._entries.get(key, {})
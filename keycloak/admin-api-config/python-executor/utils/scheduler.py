@@ -0,0 +1,212 @@
+"""
+Dependency Scheduler
+Runs orchestrator steps in dependency order on a bounded worker pool
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+from utils.logger import PadminiLogger
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of a single scheduled step."""
+    name: str
+    success: bool = False
+    skipped: bool = False
+    started: float = 0.0
+    finished: float = 0.0
+    
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class DependencyScheduler:
+    """
+    Executes steps as soon as everything they depend on has finished.
+    
+    Independent steps run in parallel on a worker pool. In reverse mode the
+    graph is walked backwards, so a step only runs after every step that
+    depends on it (used for teardown).
+    """
+    
+    def __init__(self, dependencies: Dict[str, Iterable[str]], max_workers: int = 4):
+        self.dependencies = {
+            name: tuple(deps) for name, deps in dependencies.items()
+        }
+        self.max_workers = max(1, max_workers)
+        self.logger = PadminiLogger(__name__)
+        self.order = self._topological_order()
+    
+    def _topological_order(self) -> List[str]:
+        """Return steps in dependency order, rejecting unknown deps and cycles."""
+        for name, deps in self.dependencies.items():
+            unknown = [dep for dep in deps if dep not in self.dependencies]
+            if unknown:
+                raise ValueError(f"Step '{name}' depends on unknown steps: {unknown}")
+        
+        order, visiting, visited = [], set(), set()
+        
+        def visit(name: str, path: List[str]):
+            if name in visited:
+                return
+            if name in visiting:
+                cycle = ' → '.join(path + [name])
+                raise ValueError(f"Dependency cycle detected: {cycle}")
+            visiting.add(name)
+            for dep in self.dependencies[name]:
+                visit(dep, path + [name])
+            visiting.discard(name)
+            visited.add(name)
+            order.append(name)
+        
+        for name in self.dependencies:
+            visit(name, [])
+        return order
+    
+    def _waits_on(self, reverse: bool) -> Dict[str, set]:
+        """Map each step to the steps that must finish before it starts."""
+        if not reverse:
+            return {name: set(deps) for name, deps in self.dependencies.items()}
+        
+        dependents = {name: set() for name in self.dependencies}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                dependents[dep].add(name)
+        return dependents
+    
+    def run(
+        self,
+        actions: Dict[str, Callable[[], bool]],
+        reverse: bool = False,
+        stop_on_failure: bool = True
+    ) -> Dict[str, StepResult]:
+        """
+        Run all actions respecting the dependency graph.
+        
+        With ``stop_on_failure`` a failed step causes every step waiting on
+        it (directly or transitively) to be skipped; independent branches
+        still run to completion.
+        """
+        waits_on = self._waits_on(reverse)
+        pending = {name: set(deps) for name, deps in waits_on.items()}
+        results = {name: StepResult(name) for name in self.dependencies}
+        origin = time.monotonic()
+        
+        def execute(name: str) -> bool:
+            results[name].started = time.monotonic() - origin
+            try:
+                return bool(actions[name]())
+            except Exception as e:
+                self.logger.error(f"Step '{name}' raised: {str(e)}")
+                return False
+            finally:
+                results[name].finished = time.monotonic() - origin
+        
+        def skip_waiters(failed: str):
+            for name, deps in pending.items():
+                if failed in deps and not results[name].skipped:
+                    results[name].skipped = True
+                    self.logger.skip_operation(
+                        f"Step '{name}'", f"depends on failed step '{failed}'"
+                    )
+                    skip_waiters(name)
+        
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='keycloak-step'
+        ) as pool:
+            running = {}
+            while True:
+                ready = [
+                    name for name, deps in pending.items()
+                    if not deps and not results[name].skipped
+                ]
+                for name in ready:
+                    del pending[name]
+                    self.logger.debug(f"Step '{name}' started")
+                    running[pool.submit(execute, name)] = name
+                
+                if not running:
+                    break
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name].success = future.result()
+                    self.logger.debug(
+                        f"Step '{name}' finished in {results[name].duration:.2f}s"
+                    )
+                    if not results[name].success and stop_on_failure:
+                        skip_waiters(name)
+                    else:
+                        for deps in pending.values():
+                            deps.discard(name)
+            
+            # Steps that were never released (a failed dependency) are skipped
+            for name in list(pending):
+                results[name].skipped = True
+        
+        return results
+    
+    def critical_path(
+        self,
+        results: Dict[str, StepResult],
+        reverse: bool = False
+    ) -> List[str]:
+        """Longest chain of executed steps by measured duration."""
+        waits_on = self._waits_on(reverse)
+        order = list(reversed(self.order)) if reverse else self.order
+        chain_cost: Dict[str, float] = {}
+        chain_prev: Dict[str, Optional[str]] = {}
+        
+        for name in order:
+            if results[name].skipped:
+                continue
+            best_prev, best_cost = None, 0.0
+            for dep in waits_on[name]:
+                if dep in chain_cost and chain_cost[dep] > best_cost:
+                    best_prev, best_cost = dep, chain_cost[dep]
+            chain_cost[name] = best_cost + results[name].duration
+            chain_prev[name] = best_prev
+        
+        if not chain_cost:
+            return []
+        
+        tail = max(chain_cost, key=chain_cost.get)
+        path = []
+        while tail is not None:
+            path.append(tail)
+            tail = chain_prev[tail]
+        return list(reversed(path))
+    
+    def log_timing_report(
+        self,
+        results: Dict[str, StepResult],
+        reverse: bool = False
+    ):
+        """Print per-step timings and the critical path."""
+        executed = [r for r in results.values() if not r.skipped]
+        wall = max((r.finished for r in executed), default=0.0)
+        work = sum(r.duration for r in executed)
+        path = self.critical_path(results, reverse)
+        path_time = sum(results[name].duration for name in path)
+        
+        self.logger.info("⏱️  Step timing report:")
+        for result in sorted(results.values(), key=lambda r: r.started):
+            if result.skipped:
+                status = "skipped"
+            else:
+                status = "ok" if result.success else "failed"
+            self.logger.info(
+                f"   {result.name:<16} {result.duration:7.2f}s  "
+                f"(start +{result.started:.2f}s, {status})"
+            )
+        self.logger.info(
+            f"   Critical path: {' → '.join(path) or '-'} ({path_time:.2f}s)"
+        )
+        self.logger.info(
+            f"   Wall time: {wall:.2f}s, total step time: {work:.2f}s"
+        )
@@ -0,0 +1,136 @@
+"""
+Token Manager
+Admin access token lifecycle: expiry tracking, proactive refresh, re-auth
+"""
+import threading
+import time
+from typing import Optional
+from utils.logger import PadminiLogger
+from utils.transport import Transport
+
+
+class TokenManager:
+    """
+    Keeps a valid admin-cli access token for the master realm.
+    
+    Tokens are refreshed ahead of expiry with the refresh token, falling
+    back to a fresh password grant when the refresh token is gone or
+    rejected. A single lock makes concurrent callers share one refresh
+    instead of each hitting the token endpoint.
+    """
+    
+    def __init__(
+        self,
+        server_url: str,
+        username: str,
+        password: str,
+        transport: Transport,
+        refresh_margin: float = 30.0
+    ):
+        self.token_url = (
+            f"{server_url.rstrip('/')}/realms/master/protocol/openid-connect/token"
+        )
+        self.username = username
+        self.password = password
+        self.transport = transport
+        self.refresh_margin = refresh_margin
+        self.logger = PadminiLogger(__name__)
+        
+        self.access_token: Optional[str] = None
+        self._refresh_token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_expires_at = 0.0
+        self._margin = 0.0
+        self._lock = threading.Lock()
+    
+    def authenticate(self) -> bool:
+        """Obtain the first token with the password grant."""
+        with self._lock:
+            return self._password_grant()
+    
+    def get_token(self) -> Optional[str]:
+        """Current access token, refreshed first if it is about to expire."""
+        if self._is_fresh():
+            return self.access_token
+        
+        with self._lock:
+            # Another caller may have refreshed while we waited for the lock
+            if not self._is_fresh():
+                self._renew()
+            return self.access_token
+    
+    def invalidate(self, rejected_token: Optional[str]) -> Optional[str]:
+        """
+        Renew after the server rejected ``rejected_token`` (HTTP 401).
+        
+        Only the first caller holding the rejected token renews; later
+        callers get the token that replaced it.
+        """
+        with self._lock:
+            if self.access_token == rejected_token:
+                self.logger.warning("Access token rejected, renewing")
+                self._renew()
+            return self.access_token
+    
+    def _is_fresh(self) -> bool:
+        return (
+            self.access_token is not None
+            and time.monotonic() < self._expires_at - self._margin
+        )
+    
+    def _renew(self) -> bool:
+        """Refresh the token, re-authenticating if the refresh fails."""
+        if self._refresh_token and time.monotonic() < self._refresh_expires_at:
+            if self._token_request({
+                'grant_type': 'refresh_token',
+                'client_id': 'admin-cli',
+                'refresh_token': self._refresh_token
+            }):
+                self.logger.debug("Access token refreshed")
+                return True
+            self.logger.debug("Token refresh failed, re-authenticating")
+        
+        return self._password_grant()
+    
+    def _password_grant(self) -> bool:
+        return self._token_request({
+            'grant_type': 'password',
+            'client_id': 'admin-cli',
+            'username': self.username,
+            'password': self.password
+        })
+    
+    def _token_request(self, data: dict) -> bool:
+        """Call the token endpoint and record the new token's lifetimes."""
+        try:
+            requested_at = time.monotonic()
+            # Grants can be repeated safely, so retry them like reads
+            response = self.transport.send(
+                'POST',
+                self.token_url,
+                request_class='token',
+                idempotent=True,
+                data=data,
+                headers={'Content-Type': 'application/x-www-form-urlencoded'}
+            )
+            
+            if response.status_code != 200:
+                self.logger.error(f"Token request failed: {response.text}")
+                return False
+            
+            token_data = response.json()
+            expires_in = float(token_data.get('expires_in', 60))
+            
+            self.access_token = token_data['access_token']
+            self._refresh_token = token_data.get('refresh_token')
+            self._expires_at = requested_at + expires_in
+            self._refresh_expires_at = (
+                requested_at + float(token_data.get('refresh_expires_in', 0))
+            )
+            # Short-lived tokens refresh at half-life at the latest
+            self._margin = min(self.refresh_margin, expires_in / 2)
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Token request error: {str(e)}")
+            return False
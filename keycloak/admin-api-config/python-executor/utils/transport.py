@@ -0,0 +1,255 @@
+"""
+HTTP Transport Policy
+Timeouts, retries with backoff, Retry-After and a circuit breaker
+"""
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+import requests
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential_jitter
+)
+from utils.logger import PadminiLogger
+
+# Verbs that may be repeated without changing the outcome
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+# Responses worth retrying: throttling and gateway / restart errors
+RETRYABLE_STATUSES = frozenset({429, 502, 503, 504})
+
+# The server refused without processing, safe to retry for any verb
+REFUSED_STATUSES = frozenset({429, 503})
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised without sending while the circuit breaker is open."""
+
+
+@dataclass
+class TransportPolicy:
+    """Timeouts, retry and circuit breaker settings for Admin API calls."""
+    # Request class → (connect timeout, read timeout) in seconds
+    timeouts: Dict[str, Tuple[float, float]] = field(default_factory=lambda: {
+        'read': (5.0, 30.0),
+        'write': (5.0, 60.0),
+        'bulk': (5.0, 300.0),
+        'token': (5.0, 15.0)
+    })
+    max_retries: int = 4
+    backoff_initial: float = 0.5
+    backoff_max: float = 15.0
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 30.0
+    
+    def timeout(self, request_class: str) -> Tuple[float, float]:
+        return self.timeouts.get(request_class, self.timeouts['read'])
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    
+    After ``threshold`` failures in a row the circuit opens and requests
+    fail immediately for ``cooldown`` seconds. Then a single trial request
+    is let through: success closes the circuit, failure opens it again.
+    """
+    
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.logger = PadminiLogger(__name__)
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+    
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight:
+                return False
+            if time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            # Half-open: let one trial request probe the server
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                self.logger.success("Keycloak responding again, circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            reopen = self._trial_in_flight
+            self._trial_in_flight = False
+            if reopen or (self._opened_at is None and self._failures >= self.threshold):
+                self._opened_at = time.monotonic()
+                self.times_opened += 1
+                self.logger.warning(
+                    f"Circuit opened after {self._failures} consecutive failures, "
+                    f"failing fast for {self.cooldown:.0f}s"
+                )
+
+
+class Transport:
+    """
+    Sends requests on a pooled session under a TransportPolicy.
+    
+    Idempotent verbs are retried on connection errors, timeouts and
+    429/502/503/504; other verbs only when the request never reached the
+    server (connect failure) or the server refused it (429/503). Waits use
+    exponential backoff with jitter unless the response carries a
+    Retry-After header. Every retry is counted for the end-of-run report.
+    """
+    
+    def __init__(self, session: requests.Session, policy: Optional[TransportPolicy] = None):
+        self.session = session
+        self.policy = policy or TransportPolicy()
+        self.breaker = CircuitBreaker(
+            self.policy.breaker_threshold, self.policy.breaker_cooldown
+        )
+        self.logger = PadminiLogger(__name__)
+        self.stats: Counter = Counter()
+        self._stats_lock = threading.Lock()
+    
+    def send(
+        self,
+        method: str,
+        url: str,
+        request_class: str = 'read',
+        idempotent: Optional[bool] = None,
+        **kwargs
+    ) -> requests.Response:
+        """Send a request with retries; raises on a final connection error."""
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        kwargs.setdefault('timeout', self.policy.timeout(request_class))
+        
+        retrying = Retrying(
+            stop=stop_after_attempt(self.policy.max_retries + 1),
+            wait=self._wait,
+            retry=(
+                retry_if_exception(lambda e: self._retry_exception(e, idempotent))
+                | retry_if_result(lambda r: self._retry_status(r, idempotent))
+            ),
+            before_sleep=lambda state: self._count_retry(method, url, state),
+            # Hand the last response (or exception) back to the caller
+            retry_error_callback=lambda state: state.outcome.result()
+        )
+        return retrying(self._attempt, method, url, **kwargs)
+    
+    def _attempt(self, method: str, url: str, **kwargs) -> requests.Response:
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            raise CircuitOpenError(f"Circuit open, not sending {method} {url}")
+        
+        self._count('requests')
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        
+        if response.status_code in RETRYABLE_STATUSES and response.status_code != 429:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+    
+    @staticmethod
+    def _not_sent(error: BaseException) -> bool:
+        """Whether the request certainly never reached the server."""
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        if isinstance(error, requests.ConnectionError):
+            reason = getattr(error.args[0], 'reason', None) if error.args else None
+            return type(reason).__name__ == 'NewConnectionError'
+        return False
+    
+    def _retry_exception(self, error: BaseException, idempotent: bool) -> bool:
+        if isinstance(error, CircuitOpenError):
+            return False
+        if idempotent:
+            return isinstance(error, (requests.ConnectionError, requests.Timeout))
+        return self._not_sent(error)
+    
+    @staticmethod
+    def _retry_status(response: requests.Response, idempotent: bool) -> bool:
+        statuses = RETRYABLE_STATUSES if idempotent else REFUSED_STATUSES
+        return response.status_code in statuses
+    
+    def _wait(self, state: RetryCallState) -> float:
+        """Retry-After if the server sent one, jittered backoff otherwise."""
+        backoff = wait_exponential_jitter(
+            initial=self.policy.backoff_initial, max=self.policy.backoff_max
+        )(state)
+        outcome = state.outcome
+        if outcome is None or outcome.failed:
+            return backoff
+        
+        retry_after = self._retry_after(outcome.result())
+        if retry_after is None:
+            return backoff
+        return min(retry_after, self.policy.backoff_max)
+    
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """Seconds from a Retry-After header (delta-seconds or HTTP date)."""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+    
+    def _count_retry(self, method: str, url: str, state: RetryCallState):
+        outcome = state.outcome
+        if outcome.failed:
+            reason = type(outcome.exception()).__name__
+        else:
+            reason = f"HTTP {outcome.result().status_code}"
+        
+        self._count('retries')
+        self._count(f"retries: {reason}")
+        self.logger.warning(
+            f"{method} {url} → {reason}, retry {state.attempt_number}/"
+            f"{self.policy.max_retries} in {state.next_action.sleep:.2f}s"
+        )
+    
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+    
+    def log_report(self):
+        """Print request, retry and circuit breaker counters."""
+        self.logger.info(
+            f"HTTP transport: {self.stats['requests']} requests, "
+            f"{self.stats['retries']} retries, "
+            f"{self.stats['short_circuited']} short-circuited, "
+            f"circuit opened {self.breaker.times_opened}x"
+        )
+        for key, count in sorted(self.stats.items()):
+            if key.startswith('retries: '):
+                self.logger.info(f"   {key[len('retries: '):]:<24} {count} retries")